@@ -1,8 +1,5 @@
 from typing import Optional
 import logging
-from .tagging.tagger import tag_synthesis
-from .interpreting import extract_actions
-from .finishing import action_list_to_xdl
 from .logging import get_logger
 
 #  python -m synthreader.synthreader.main
@@ -18,6 +15,12 @@ def text_to_xdl(synthesis_text: str, save_file: Optional[str] = None) -> str:
     Returns:
         str: Raw XDL str of synthesis text interpretation.
     """
+    # Imported here so that importing this module doesn't pull in the whole
+    # tagging/interpreting/finishing stack (and nltk) up front.
+    from .tagging.tagger import tag_synthesis
+    from .interpreting import extract_actions
+    from .finishing import action_list_to_xdl
+
     logger = get_logger()
     logger.setLevel(logging.INFO)
     logger.info('Tagging entities in text...')
@@ -31,7 +34,8 @@ def text_to_xdl(synthesis_text: str, save_file: Optional[str] = None) -> str:
         logger.info(f'Saved to {save_file}')
     return xdl
 
-xdl = text_to_xdl("2,6-Dimethylaniline (3.0 mL, 2.9 g, 24.4 mmol) is added to 15 mL of glacial acetic acid followed by chloroacetyl chloride (2.0 mL, 2.85 g, 25.1 mmol) and 25 mL of half-saturated aqueous sodium acetate")
+if __name__ == "__main__":
+    xdl = text_to_xdl("2,6-Dimethylaniline (3.0 mL, 2.9 g, 24.4 mmol) is added to 15 mL of glacial acetic acid followed by chloroacetyl chloride (2.0 mL, 2.85 g, 25.1 mmol) and 25 mL of half-saturated aqueous sodium acetate")
 
 # 1. 去除冗余信息
 # 2. 分句，分词，词性标注
@@ -9,6 +9,8 @@ class Optional(Word):
 class Regexp(object):
     def __init__(self, regexp):
         self.regexp = regexp
+        # Compiled once here rather than on every is_match call.
+        self.compiled = re.compile(regexp)
 
 class Pos(object):
     def __init__(self, pos):
@@ -38,6 +40,13 @@ def apply_pattern(
             use for instantiating word_class. If not given entire pattern is
             used.
     """
+    pattern_len = len(pattern)
+    # For each position in pattern, whether everything from there on is
+    # Optional. Precomputed so the end-of-sentence check is a lookup.
+    optional_tail = [
+        all(type(item) == Optional for item in pattern[k:])
+        for k in range(pattern_len + 1)
+    ]
     i = 0
     while i < len(sentences):
         words = sentences[i]
@@ -48,7 +57,7 @@ def apply_pattern(
             sentence_idx = 0  # Index into sentence
 
             # These need to be handled separately for OPTIONAL words.
-            while pattern_idx < len(pattern):
+            while pattern_idx < pattern_len:
                 # If sentence index within sentence.
                 if j + sentence_idx < len(words):
                     # Get target from pattern and word from words.
@@ -64,7 +73,7 @@ def apply_pattern(
 
                         else:
                             # Optional word not found, try next item in pattern
-                            if pattern_idx + 1 < len(pattern):
+                            if pattern_idx + 1 < pattern_len:
                                 pattern_idx += 1
                                 continue
                             # Optional word not found and end of pattern reached
@@ -78,10 +87,7 @@ def apply_pattern(
 
                 # If sentence index not within sentence break.
                 else:
-                    if all([
-                        type(item) == Optional
-                        for item in pattern[pattern_idx:]]
-                    ):
+                    if optional_tail[pattern_idx]:
                         break
                     else:
                         pattern_match = False
@@ -138,7 +144,7 @@ def is_match(target: Union[type, str], word: Word) -> bool:
             return False
 
     elif type(target) == Regexp:
-        if re.match(target.regexp, str(word)):
+        if target.compiled.match(str(word)):
             return True
         return False
 
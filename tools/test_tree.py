@@ -2,28 +2,62 @@ from lxml import etree
 from xdl.xdl.readwrite.utils import read_file
 
 xdl_file = "a.xdl"
-xdl_str = read_file(xdl_file)
 
-xdl_tree = etree.fromstring(xdl_str)
 
-# 遍历到 Synthesis
-synthesis = xdl_tree.find("Synthesis")
-
-# 再找 Procedure
-procedure = synthesis.find("Procedure")
-
-Reagents = synthesis.find("Reagents")
-
-Hardware = synthesis.find("Hardware")
+def synthesis_section(elem):
+    """返回 elem 所在的 Synthesis 子段落标签（Hardware/Reagents/Procedure），否则 None"""
+    parent = elem.getparent()
+    if parent is None:
+        return None
+    grandparent = parent.getparent()
+    if grandparent is None or grandparent.tag != "Synthesis":
+        return None
+    return parent.tag
+
+
+def collect(events, clear):
+    """按 Synthesis 子段落收集步骤、试剂和硬件；clear 为 True 时清理已处理节点"""
+    steps, reagents, hardware = [], [], []
+    for _, elem in events:
+        section = synthesis_section(elem)
+        if section == "Procedure":
+            steps.append((elem.tag, dict(elem.attrib)))
+        elif section == "Reagents" and elem.tag == "Reagent":
+            reagents.append((elem.tag, dict(elem.attrib)))
+        elif section == "Hardware" and elem.tag == "HardwareItem":
+            hardware.append((elem.tag, dict(elem.attrib)))
+        elif elem.tag != "Blueprint":
+            continue
+
+        if clear:
+            # 清理已处理节点及其前序兄弟节点
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    return steps, reagents, hardware
+
+
+# 流式解析 XDL（iterparse），处理完的节点及时清理，内存占用不随文件增长
+try:
+    steps, reagents, hardware = collect(
+        etree.iterparse(xdl_file, events=("end",)), clear=True
+    )
+except etree.XMLSyntaxError:
+    # 非UTF-8且未声明编码的文件（如Windows保存的ISO-8859-1）无法流式解析，
+    # 与 retrieve_blueprint 一样用 read_file 的编码回退整体读取后再解析
+    xdl_tree = etree.fromstring(read_file(xdl_file))
+    steps, reagents, hardware = collect(
+        etree.iterwalk(xdl_tree, events=("end",)), clear=False
+    )
 
 # 遍历步骤
-for step in procedure.findall("*"):
-    print(step.tag, step.attrib)
+for tag, attrib in steps:
+    print(tag, attrib)
 
 # 遍历 Reagents
-for reagent in Reagents.findall("Reagent"):
-    print(reagent.tag, reagent.attrib)  
+for tag, attrib in reagents:
+    print(tag, attrib)
 
 # 遍历 Hardware
-for hardware in Hardware.findall("HardwareItem"):
-    print(hardware.tag, hardware.attrib)
\ No newline at end of file
+for tag, attrib in hardware:
+    print(tag, attrib)
@@ -1,6 +1,18 @@
+import hashlib
 import json
+import os
+import numpy as np
 import matplotlib.pyplot as plt
 import networkx as nx
+from matplotlib.collections import LineCollection, PathCollection
+from matplotlib.lines import Line2D
+from matplotlib.markers import MarkerStyle
+from matplotlib.transforms import Affine2D, IdentityTransform
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # 未安装 orjson 时退回标准库
+    from json import loads as json_loads
 
 # ========== Step 1: 加载你的 JSON ==========
 src = "files/chem_yan.json"
@@ -10,82 +22,131 @@ save_name = "yan-test.png"
 # --------------------------
 # 1. 数据加载与关键信息提取
 # --------------------------
-with open(src, "r") as f:
-    data = json.load(f)
-
-
-# ========== Step 2: 构建图结构 ==========
-G = nx.MultiDiGraph()
-
-# 添加节点
-for node in data["nodes"]:
-    G.add_node(
-        node["id"],
-        pos=(node["x"], node["y"]),
-        type=node["type"],
-        label=node.get("label", node["id"]),
-    )
-
-# 添加边
-for link in data["links"]:
-    G.add_edge(link["source"], link["target"])
-
-# ========== Step 3: 提取布局坐标 ==========
-# 添加节点
+with open(src, "rb") as f:
+    raw = f.read()
+data = json_loads(raw)
+# 布局缓存键先对原始字节做哈希，之后即可释放 raw
+layout_hasher = hashlib.blake2b(raw, digest_size=8)
+del raw
+
+
+# ========== Step 2: 构建扁平数组（SoA）表示 ==========
+# 可视化只需要 id/type/label/坐标 和边的端点，不再为每个节点/边创建 nx 属性字典
+# 单次遍历 data["nodes"] 同时提取各列（含布局坐标）
+ids, types, labels, coords = [], [], [], []
 for node in data["nodes"]:
-    x = node.get("x", 0)
-    y = node.get("y", 0)
-    G.add_node(
-        node["id"],
-        pos=(float(x), float(y)),  # 强制转为 float
-        type=node.get("type", "unknown"),
-        label=node.get("label", node["id"]),
-    )
-import math
-import math
-import matplotlib.pyplot as plt
-import networkx as nx
+    ids.append(node["id"])
+    types.append(node.get("type", "unknown"))
+    labels.append(node.get("label", node["id"]))
+    coords.append(node.get("x", 0))
+    coords.append(node.get("y", 0))
+id_to_idx = {node_id: i for i, node_id in enumerate(ids)}
+types = np.array(types)
+# 原始坐标一次性批量转为 float64（不再逐个调用 float()）
+xy = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+del coords
+
+# 边：端点下标（int32），生成器单次遍历 data["links"]
+edge_index = np.fromiter(
+    (
+        i
+        for link in data["links"]
+        for i in (id_to_idx[link["source"]], id_to_idx[link["target"]])
+    ),
+    dtype=np.int32,
+    count=2 * len(data["links"]),
+).reshape(-1, 2)
+edge_src, edge_dst = edge_index[:, 0], edge_index[:, 1]
+
+# 解析后的 JSON 已全部转为上面的数组/列表，释放以降低峰值内存
+del data
+
+# 无向邻接表：一次构建，布局时直接复用（后继 + 前驱）
+undirected_adj = {node_id: set() for node_id in ids}
+for u, v in zip(edge_src.tolist(), edge_dst.tolist()):
+    undirected_adj[ids[u]].add(ids[v])
+    undirected_adj[ids[v]].add(ids[u])
 
 # ========== Step X: 自定义以 reactor 为中心的紧凑布局 ==========
-reactors = [n for n in G.nodes if G.nodes[n].get("type") == "reactor"]
-center = reactors[0] if reactors else list(G.nodes)[0]
-
-pos = {}
-pos[center] = (0, 0)
+reactors = np.flatnonzero(types == "reactor")
+center = ids[reactors[0]] if len(reactors) else ids[0]
 
-valves = [n for n in G.nodes if G.nodes[n].get("type") == "valve"]
+valves = [ids[i] for i in np.flatnonzero(types == "valve")]
 
 # ---- 层级半径设置（紧凑比例） ----
 R_valve = 5  # reactor 到 valve 距离
 R_local = 1.8  # valve 簇内部节点距离
 R_outer = R_valve + 3  # 孤立节点外圈
 
-# ---- valve 排布在中心周围 ----
-for i, v in enumerate(valves):
-    angle = 2 * math.pi * i / len(valves)
-    pos[v] = (R_valve * math.cos(angle), R_valve * math.sin(angle))
-
-# ---- valve 的邻居围绕局部环 ----
-for v in valves:
-    neighbors = list(G.neighbors(v)) + [u for u in G.predecessors(v)]
-    neighbors = list(set(neighbors) - {v, center})
-    for j, n in enumerate(neighbors):
-        if n not in pos:
-            angle = 2 * math.pi * j / max(len(neighbors), 1)
-            pos[n] = (
-                pos[v][0] + R_local * math.cos(angle),
-                pos[v][1] + R_local * math.sin(angle),
-            )
-
-# ---- 未放置节点（外圈） ----
-unplaced = [n for n in G.nodes if n not in pos]
-for i, n in enumerate(unplaced):
-    angle = 2 * math.pi * i / max(len(unplaced), 1)
-    pos[n] = (R_outer * math.cos(angle), R_outer * math.sin(angle))
+# ---- 布局缓存：JSON 内容与布局参数不变时直接复用上次计算的坐标 ----
+layout_hasher.update(repr((R_valve, R_local, R_outer)).encode())
+layout_key = layout_hasher.hexdigest()
+layout_cache = os.path.join(os.path.dirname(src), f".layout_vis_{layout_key}.json")
+
+if os.path.exists(layout_cache):
+    # 缓存只保存 [节点, x, y] 浮点坐标（JSON，不用 pickle，加载时不会执行代码）
+    with open(layout_cache, "rb") as f:
+        pos = {n: (x, y) for n, x, y in json_loads(f.read())}
+else:
+    pos = {}
+    pos[center] = (0, 0)
+
+    # ---- valve 排布在中心周围（NumPy 批量计算三角函数） ----
+    angles = 2 * np.pi * np.arange(len(valves)) / max(len(valves), 1)
+    coords = np.column_stack((R_valve * np.cos(angles), R_valve * np.sin(angles)))
+    pos.update(zip(valves, map(tuple, coords.tolist())))
+
+    # ---- valve 的邻居围绕局部环 ----
+    for v in valves:
+        neighbors = list(undirected_adj[v] - {v, center})
+        angles = 2 * np.pi * np.arange(len(neighbors)) / max(len(neighbors), 1)
+        offsets = R_local * np.column_stack((np.cos(angles), np.sin(angles)))
+        for n, (dx, dy) in zip(neighbors, offsets.tolist()):
+            if n not in pos:
+                pos[n] = (pos[v][0] + dx, pos[v][1] + dy)
+
+    # ---- 未放置节点（外圈） ----
+    unplaced = [n for n in ids if n not in pos]
+    angles = 2 * np.pi * np.arange(len(unplaced)) / max(len(unplaced), 1)
+    coords = np.column_stack((R_outer * np.cos(angles), R_outer * np.sin(angles)))
+    pos.update(zip(unplaced, map(tuple, coords.tolist())))
+
+    with open(layout_cache, "w", encoding="utf-8") as f:
+        json.dump([[n, x, y] for n, (x, y) in pos.items()], f)
 
 print(f"✅ 紧凑布局完成，共 {len(pos)} 个节点。")
 
+# 坐标转为 (N, 2) float32 数组，按节点下标访问（绘制时不再逐个查 dict）
+pos_arr = np.fromiter(
+    (c for n in ids for c in pos[n]), dtype=np.float32, count=2 * len(ids)
+).reshape(-1, 2)
+
+# ---- 导出带布局坐标的 JSON，供 1.html 直接使用（浏览器端不再计算布局） ----
+layout_data = {
+    "nodes": [
+        {
+            "id": node_id,
+            "type": t,
+            "label": label,
+            "layout_x": float(pos[node_id][0]),
+            "layout_y": float(pos[node_id][1]),
+        }
+        for node_id, t, label in zip(ids, types.tolist(), labels)
+    ],
+    "links": [
+        {"source": ids[u], "target": ids[v]}
+        for u, v in zip(edge_src.tolist(), edge_dst.tolist())
+    ],
+}
+layout_json = os.path.splitext(src)[0] + "_layout.json"
+with open(layout_json, "w", encoding="utf-8") as f:
+    json.dump(layout_data, f, ensure_ascii=False)
+
 # ========== Step Y: 绘制（放大比例 + 优化外观） ==========
+# 标签仍由 nx 绘制：仅在此处由扁平数组构建节点图
+G = nx.MultiDiGraph()
+G.add_nodes_from(ids)
+
 plt.figure(figsize=(10, 8))
 plt.axis("off")
 
@@ -100,38 +161,80 @@ node_types = {
     "vacuum": {"color": "#17becf", "shape": "h", "size": 1500},
 }
 
-# ---- 绘制节点 ----
+# ---- 绘制节点（一次 ax.scatter，按节点替换各自类型的 marker 路径） ----
+ax = plt.gca()
+node_order, node_paths, node_colors, node_sizes, legend_handles = [], [], [], [], []
+present_types = set(np.unique(types).tolist())
 for t, style in node_types.items():
-    nodelist = [n for n in G.nodes if G.nodes[n].get("type") == t]
-    if nodelist:
-        nx.draw_networkx_nodes(
-            G,
-            pos,
-            nodelist=nodelist,
-            node_color=style["color"],
-            node_shape=style["shape"],
-            node_size=style["size"],
-            alpha=0.9,
-            label=t,
+    if t in present_types:
+        idx = np.flatnonzero(types == t)
+        marker = MarkerStyle(style["shape"])
+        path = marker.get_path().transformed(marker.get_transform())
+        node_order.append(idx)
+        node_paths.extend([path] * len(idx))
+        node_colors.extend([style["color"]] * len(idx))
+        node_sizes.extend([style["size"]] * len(idx))
+        legend_handles.append(
+            Line2D(
+                [],
+                [],
+                marker=style["shape"],
+                color=style["color"],
+                linestyle="",
+                markersize=style["size"] ** 0.5,
+                alpha=0.9,
+                label=t,
+            )
         )
-
-# ---- 绘制边 ----
-nx.draw_networkx_edges(
-    G,
-    pos,
-    arrows=True,
-    arrowstyle="-|>",
-    arrowsize=18,
-    width=2,
-    edge_color="gray",
-    alpha=0.7,
+node_xy = pos_arr[np.concatenate(node_order)] if node_order else pos_arr[:0]
+node_collection = ax.scatter(
+    node_xy[:, 0],
+    node_xy[:, 1],
+    s=node_sizes,
+    c=node_colors,
+    linewidths=0,
+    alpha=0.9,
+    zorder=2,
+)
+node_collection.set_paths(node_paths)
+
+# ---- 绘制边（LineCollection 一次绘制，箭头合并为一个 PathCollection） ----
+xy_src, xy_dst = pos_arr[edge_src], pos_arr[edge_dst]
+ax.add_collection(
+    LineCollection(
+        np.stack((xy_src, xy_dst), axis=1),
+        colors="gray",
+        linewidths=2,
+        alpha=0.7,
+        zorder=1,
+    )
+)
+# 箭头放在边的 60% 处（终点被节点遮挡），按边方向旋转三角形
+arrow_angles = np.arctan2(xy_dst[:, 1] - xy_src[:, 1], xy_dst[:, 0] - xy_src[:, 0])
+arrow_marker = MarkerStyle(">")
+arrow_base = arrow_marker.get_path().transformed(arrow_marker.get_transform())
+ax.add_collection(
+    PathCollection(
+        [arrow_base.transformed(Affine2D().rotate(a)) for a in arrow_angles],
+        sizes=[(18 / 2) ** 2] * len(arrow_angles),
+        offsets=xy_src + 0.6 * (xy_dst - xy_src),
+        offset_transform=ax.transData,
+        transform=IdentityTransform(),
+        facecolors="gray",
+        edgecolors="none",
+        alpha=0.7,
+        zorder=1,
+    )
 )
+ax.set_aspect("equal")
+ax.margins(0.1)
+ax.autoscale_view()
 
 # ---- 绘制标签 ----
 nx.draw_networkx_labels(
     G,
     pos,
-    labels={n: G.nodes[n].get("label", n) for n in G.nodes},
+    labels=dict(zip(ids, labels)),
     font_size=9,
     font_color="black",
 )
@@ -142,7 +245,7 @@ circle = plt.Circle(
 )
 plt.gca().add_artist(circle)
 
-plt.legend(fontsize=8, loc="upper right")
+plt.legend(handles=legend_handles, fontsize=8, loc="upper right")
 plt.tight_layout()
 plt.savefig(f"{save_name}", dpi=400, bbox_inches="tight")
 # plt.show()
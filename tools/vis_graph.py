@@ -1,29 +1,50 @@
 import networkx as nx
 import matplotlib.pyplot as plt
-from networkx.readwrite import json_graph
+import hashlib
 import json
-import math
+import os
+import numpy as np
 import textwrap
 from collections import defaultdict
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # 未安装 orjson 时退回标准库
+    from json import loads as json_loads
+
 src = "chem_yan.json"
 
 # --------------------------
 # 1. 数据加载与关键信息提取
 # --------------------------
-with open(src, "r") as f:
-    json_data = json.load(f)
-graph = json_graph.node_link_graph(
-    json_data, directed=True, multigraph=True, edges="links"
-)
-nodes = list(graph.nodes)
+with open(src, "rb") as f:
+    raw = f.read()
+json_data = json_loads(raw)
+# 扁平数组（SoA）表示：节点 id/type 列 + 边端点下标（int32），不构建 nx 属性字典
+nodes = [node["id"] for node in json_data["nodes"]]
 node_count = len(nodes)
+id_to_idx = {node: i for i, node in enumerate(nodes)}
+node_types = np.array([node.get("type", "default") for node in json_data["nodes"]])
+edge_src = np.fromiter(
+    (id_to_idx[link["source"]] for link in json_data["links"]),
+    dtype=np.int32,
+    count=len(json_data["links"]),
+)
+edge_dst = np.fromiter(
+    (id_to_idx[link["target"]] for link in json_data["links"]),
+    dtype=np.int32,
+    count=len(json_data["links"]),
+)
+# 按起点稳定排序，与多重图邻接表的遍历顺序保持一致
+edge_order = np.argsort(edge_src, kind="stable")
+edge_src, edge_dst = edge_src[edge_order], edge_dst[edge_order]
+edges = [(nodes[u], nodes[v]) for u, v in zip(edge_src.tolist(), edge_dst.tolist())]
 
 # 提取节点类型、连接关系（用于归簇）
-node_type_dict = {node: graph.nodes[node].get("type", "default") for node in nodes}
+node_type_dict = dict(zip(nodes, node_types.tolist()))
 # 构建节点连接字典：key=节点，value=直接连接的所有节点
 node_connections = defaultdict(list)
-for u, v, _ in graph.edges:  # 多重图，边格式为(u, v, edge_id)
+for u, v in edges:
     node_connections[u].append(v)
     node_connections[v].append(u)  # 双向记录，确保无向连接也能识别
 
@@ -66,41 +87,51 @@ if unassigned_nodes:
 # --------------------------
 # 3. 簇状布局计算（Valve中心+簇内放射+簇间均匀分布）
 # --------------------------
-pos = {}  # 最终节点位置字典
-
 # 3.1 簇间间距配置（控制簇与簇的距离，避免拥挤）
 cluster_horizontal_gap = 8.0  # 簇之间的横向间距（核心参数，可调整）
 cluster_vertical_range = 3.0  # 簇内设备的纵向分布范围（避免簇过高）
-
-# 3.2 为每个簇分配整体位置（横向排列簇，如Valve1在x=2，Valve2在x=10，Valve3在x=18...）
-for cluster_idx, (valve_center, cluster_nodes) in enumerate(cluster_dict.items()):
-    # 1. 确定当前簇的中心X坐标（横向均匀分布）
-    cluster_center_x = 2.0 + cluster_idx * cluster_horizontal_gap  # 第一个簇从x=2开始
-    cluster_center_y = 0.0  # 所有簇的Y坐标统一为0（横向排列，避免上下偏移）
-
-    # 2. 设置Valve中心节点的位置（簇的绝对中心）
-    pos[valve_center] = (cluster_center_x, cluster_center_y)
-
-    # 3. 簇内非Valve设备：围绕Valve呈小范围放射状分布（避免簇内拥挤）
-    cluster_size = len(cluster_nodes)  # 簇内设备数量
-    if cluster_size == 0:
-        continue  # 无设备的簇，跳过
-
-    # 簇内放射方向：4个方向（上、右、下、左）循环，避免重叠（比8方向更紧凑）
-    cluster_directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # 上、右、下、左
-    # 簇内设备与Valve的距离（固定，确保簇内紧凑）
-    cluster_radius = 1.5  # 核心参数：越小簇越紧凑
-
-    # 为簇内每个设备分配位置
-    for idx, device_node in enumerate(cluster_nodes):
-        # 循环选择方向（0→上，1→右，2→下，3→左，4→上...）
-        dir_idx = idx % len(cluster_directions)
-        dx, dy = cluster_directions[dir_idx]
-        # 计算设备节点位置（Valve中心 + 方向*距离）
-        pos[device_node] = (
-            cluster_center_x + dx * cluster_radius,
-            cluster_center_y + dy * cluster_radius,
-        )
+# 簇内放射方向：4个方向（上、右、下、左）循环，避免重叠（比8方向更紧凑）
+cluster_directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]  # 上、右、下、左
+# 簇内设备与Valve的距离（固定，确保簇内紧凑）
+cluster_radius = 1.5  # 核心参数：越小簇越紧凑
+
+# 3.2 布局缓存：JSON 内容与布局参数不变时直接复用上次计算的坐标
+layout_key = hashlib.blake2b(
+    raw
+    + repr((cluster_horizontal_gap, cluster_directions, cluster_radius)).encode(),
+    digest_size=8,
+).hexdigest()
+layout_cache = os.path.join(os.path.dirname(src), f".layout_vis_graph_{layout_key}.json")
+
+if os.path.exists(layout_cache):
+    # 缓存只保存 [节点, x, y] 浮点坐标（JSON，不用 pickle，加载时不会执行代码）
+    with open(layout_cache, "rb") as f:
+        pos = {n: (x, y) for n, x, y in json_loads(f.read())}
+else:
+    pos = {}  # 最终节点位置字典
+
+    # 3.3 为每个簇分配整体位置（横向排列簇，如Valve1在x=2，Valve2在x=10，Valve3在x=18...）
+    for cluster_idx, (valve_center, cluster_nodes) in enumerate(cluster_dict.items()):
+        # 1. 确定当前簇的中心X坐标（横向均匀分布）
+        cluster_center_x = 2.0 + cluster_idx * cluster_horizontal_gap  # 第一个簇从x=2开始
+        cluster_center_y = 0.0  # 所有簇的Y坐标统一为0（横向排列，避免上下偏移）
+
+        # 2. 设置Valve中心节点的位置（簇的绝对中心）
+        pos[valve_center] = (cluster_center_x, cluster_center_y)
+
+        # 3. 簇内非Valve设备：围绕Valve呈小范围放射状分布（避免簇内拥挤）
+        cluster_size = len(cluster_nodes)  # 簇内设备数量
+        if cluster_size == 0:
+            continue  # 无设备的簇，跳过
+
+        # 为簇内每个设备分配位置（NumPy 批量计算，0→上，1→右，2→下，3→左，4→上...）
+        dir_idx = np.arange(cluster_size) % len(cluster_directions)
+        dirs = np.array(cluster_directions)[dir_idx]
+        coords = np.array([cluster_center_x, cluster_center_y]) + dirs * cluster_radius
+        pos.update(zip(cluster_nodes, map(tuple, coords.tolist())))
+
+    with open(layout_cache, "w", encoding="utf-8") as f:
+        json.dump([[n, x, y] for n, (x, y) in pos.items()], f)
 
 # --------------------------
 # 4. 视觉样式优化（强化簇与簇的区分）
@@ -138,28 +169,23 @@ node_border_widths = [4.0 if node_type_dict[node] == "valve" else 2.0 for node i
 # --------------------------
 # 5. 边样式优化（簇内边粗，簇间边细，避免混乱）
 # --------------------------
-# 5.1 判断边是否为"簇内边"（连接同一Valve簇的节点）
+# 5.1 节点→簇中心映射（一次性构建，边/标签处理时 O(1) 查询）
+node_to_cluster = {}
+for valve, cluster_nodes in cluster_dict.items():
+    node_to_cluster[valve] = valve
+    for node in cluster_nodes:
+        node_to_cluster.setdefault(node, valve)
+
+
 def is_intra_cluster_edge(u, v):
     """判断边u-v是否在同一簇内"""
-    # 找到u所属的簇中心
-    u_cluster = None
-    for valve, cluster_nodes in cluster_dict.items():
-        if u == valve or u in cluster_nodes:
-            u_cluster = valve
-            break
-    # 找到v所属的簇中心
-    v_cluster = None
-    for valve, cluster_nodes in cluster_dict.items():
-        if v == valve or v in cluster_nodes:
-            v_cluster = valve
-            break
-    return u_cluster == v_cluster  # 同一簇返回True
+    return node_to_cluster.get(u) == node_to_cluster.get(v)  # 同一簇返回True
 
 
 # 5.2 边的宽度：簇内边粗（突出簇内连接），簇间边细（弱化跨簇干扰）
 edge_widths = []
 edge_colors = []
-for u, v, _ in graph.edges:
+for u, v in edges:
     if is_intra_cluster_edge(u, v):
         edge_widths.append(3.0)  # 簇内边：粗
         edge_colors.append("#2C3E50CC")  # 深灰半透明（清晰）
@@ -186,11 +212,7 @@ for node in nodes:
         label_pos[node] = (x, y - label_offset - 0.2)  # 额外下移0.2，远离簇内设备
     else:
         # 非Valve设备：找到其所属Valve簇中心，标签向远离中心的方向偏移
-        cluster_center = None
-        for valve, cluster_nodes in cluster_dict.items():
-            if node in cluster_nodes or node == valve:
-                cluster_center = valve
-                break
+        cluster_center = node_to_cluster.get(node)
         if cluster_center:
             cx, cy = pos[cluster_center]
             # 计算设备相对于Valve的方向（远离方向偏移标签）
@@ -226,10 +248,16 @@ for spine in ax.spines.values():
 ax.set_xticks([])
 ax.set_yticks([])
 
-# 7.3 绘制节点（Valve中心突出）
+# 7.3 nx 绘图接口需要图对象：仅在此处由扁平数组构建
+graph = nx.MultiDiGraph()
+graph.add_nodes_from(nodes)
+graph.add_edges_from(edges)
+
+# 7.4 绘制节点（Valve中心突出）
 nx.draw_networkx_nodes(
     graph,
     pos,
+    nodelist=nodes,
     node_size=node_sizes,
     node_color=node_colors,
     alpha=0.9,
@@ -237,10 +265,11 @@ nx.draw_networkx_nodes(
     linewidths=node_border_widths,
 )
 
-# 7.4 绘制边（簇内/簇间区分明显）
+# 7.5 绘制边（簇内/簇间区分明显）
 nx.draw_networkx_edges(
     graph,
     pos,
+    edgelist=edges,
     arrowstyle="->",
     arrowsize=edge_arrowsizes,
     edge_color=edge_colors,
@@ -249,13 +278,13 @@ nx.draw_networkx_edges(
     connectionstyle="arc3,rad=0.03",  # 轻微弧度，避免簇内边重叠
 )
 
-# 7.5 绘制标签（Valve标签突出，其他不重叠）
-for node in nodes:
+# 7.6 绘制标签（Valve标签突出，其他不重叠）
+for i, node in enumerate(nodes):
     plt.text(
         label_pos[node][0],
         label_pos[node][1],
         wrapped_labels[node],
-        fontsize=label_font_sizes[list(nodes).index(node)],
+        fontsize=label_font_sizes[i],
         fontweight="bold",
         ha="center",
         va="center",
@@ -264,7 +293,7 @@ for node in nodes:
         ),  # 白色背景，避免被边遮挡
     )
 
-# 7.6 添加簇区分辅助线（可选，用虚线框住每个簇，更清晰）
+# 7.7 添加簇区分辅助线（可选，用虚线框住每个簇，更清晰）
 for cluster_idx, (valve_center, cluster_nodes) in enumerate(cluster_dict.items()):
     cx, cy = pos[valve_center]
     # 簇的虚线框范围（比簇内设备大0.5）
@@ -285,7 +314,7 @@ for cluster_idx, (valve_center, cluster_nodes) in enumerate(cluster_dict.items()
     )
     ax.add_patch(rect)
 
-# 7.7 保存图片（高分辨率，无多余留白）
+# 7.8 保存图片（高分辨率，无多余留白）
 plt.xlim(min_x, max_x)
 plt.ylim(min_y, max_y)
 plt.tight_layout()
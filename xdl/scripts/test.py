@@ -2,6 +2,8 @@ from ChemputerConvergence.libraries.Chempiler.chempiler.chempiler import Chempil
 import ChemputerConvergence.libraries.chemputerapi.ChemputerAPI as ChemputerAPI
 import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import appdirs
 from xdl.xdl import XDL
 
@@ -42,117 +44,94 @@ from xdl.xdl import XDL
 #     )
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="XDL流程分步执行工具（画图/编译/执行）"
-    )
+def graph_is_fresh(xdl_file, graph_file):
+    """Graph文件已存在且比XDL文件新时返回True（类似make，可跳过重新画图）"""
+    try:
+        return os.stat(graph_file).st_mtime > os.stat(xdl_file).st_mtime
+    except FileNotFoundError:
+        return False
 
-    # 1. 公共参数（所有步骤都可能用到）
-    parser.add_argument(
-        "--xdl_file", default="files/chem_yan1.xdl", type=str, help="输入xdl"
-    )
-    parser.add_argument(
-        "--graph_file",
-        default=None,
-        type=str,
-        help="生成/使用的Graph JSON文件路径（默认：与XDL同目录，后缀替换为.json）",
-    )
-    parser.add_argument(
-        "--interactive",
-        action="store_true",
-        help="编译时启用交互模式（仅编译步骤生效）",
-    )
-
-    # 2. 核心：步骤选择参数（必选，指定执行哪一步）
-    parser.add_argument(
-        "--step",
-        default="run",
-        required=False,
-        choices=["graph", "compile", "run"],
-        help="指定执行的步骤：\n"
-        "graph - 仅生成Graph图（第一步）\n"
-        "compile - 仅编译XDL流程（第二步，需先执行draw生成graph_file）\n"
-        "run - 仅执行编译后的流程（第三步，需先执行compile）",
-    )
-
-    args = parser.parse_args()
 
+def run_step(step, xdl_file, graph_file=None, interactive=False):
+    """对单个XDL文件执行指定步骤（graph/compile/run）"""
     # --------------------------
     # 预处理：统一Graph文件路径（避免重复逻辑）
     # --------------------------
-    if args.graph_file is None:
+    if graph_file is None:
         # 默认：将XDL文件后缀改为.json（如 a.xdl → a.json）
-        if args.xdl_file.endswith(".xdl"):
-            args.graph_file = args.xdl_file[:-4] + ".json"
+        if xdl_file.endswith(".xdl"):
+            graph_file = xdl_file[:-4] + ".json"
         else:
             # 若XDL文件无.xdl后缀，直接在末尾加.json
-            args.graph_file = args.xdl_file + ".json"
+            graph_file = xdl_file + ".json"
 
     # --------------------------
     # 步骤1：仅生成Graph图（draw）
     # --------------------------
-    if args.step == "graph":
+    if step == "graph":
         # 检查XDL文件是否存在
-        if not os.path.exists(args.xdl_file):
-            raise FileNotFoundError(f"XDL文件不存在：{args.xdl_file}")
+        if not os.path.exists(xdl_file):
+            raise FileNotFoundError(f"XDL文件不存在：{xdl_file}")
 
         # 加载XDL并生成Graph图
-        print(f"[第一步：画图] 从 {args.xdl_file} 生成Graph图 → {args.graph_file}")
-        x = XDL(args.xdl_file)
-        x.graph(save=args.graph_file)  # 生成Graph JSON并保存
-        print(f"[完成] Graph图已保存至：{os.path.abspath(args.graph_file)}")
+        print(f"[第一步：画图] 从 {xdl_file} 生成Graph图 → {graph_file}")
+        x = XDL(xdl_file)
+        x.graph(save=graph_file)  # 生成Graph JSON并保存
+        print(f"[完成] Graph图已保存至：{os.path.abspath(graph_file)}")
         return  # 执行完第一步后退出，不继续后续步骤
 
     # --------------------------
     # 步骤2：仅编译XDL流程（compile）
     # --------------------------
-    elif args.step == "compile":
+    elif step == "compile":
         # 检查依赖文件（XDL和Graph文件）
-        if not os.path.exists(args.xdl_file):
-            raise FileNotFoundError(f"XDL文件不存在：{args.xdl_file}")
-        if not os.path.exists(args.graph_file):
+        if not os.path.exists(xdl_file):
+            raise FileNotFoundError(f"XDL文件不存在：{xdl_file}")
+        if not os.path.exists(graph_file):
             raise FileNotFoundError(
                 f"Graph文件不存在！请先执行 'python 脚本名.py --step draw' 生成，"
-                f"当前期望路径：{args.graph_file}"
+                f"当前期望路径：{graph_file}"
             )
 
         # 加载XDL并执行编译
         print(
-            f"[第二步：编译] 从 {args.xdl_file} 编译，使用Graph文件：{args.graph_file}"
+            f"[第二步：编译] 从 {xdl_file} 编译，使用Graph文件：{graph_file}"
         )
-        x = XDL(args.xdl_file)
+        x = XDL(xdl_file)
         x.prepare_for_execution(
-            graph_file=args.graph_file,
-            interactive=args.interactive,  # 交互模式（用户指定）
+            graph_file=graph_file,
+            interactive=interactive,  # 交互模式（用户指定）
         )
-        print(f"[完成] XDL流程编译成功（交互模式：{args.interactive}）")
+        print(f"[完成] XDL流程编译成功（交互模式：{interactive}）")
         return  # 执行完第二步后退出
 
     # --------------------------
     # 步骤3：仅执行编译后的流程（run）
     # --------------------------
-    elif args.step == "run":
+    elif step == "run":
         # 检查依赖文件（仅需Graph文件，编译已确保流程有效性）
-        if not os.path.exists(args.graph_file):
+        if not os.path.exists(graph_file):
             raise FileNotFoundError(
                 f"Graph文件不存在！请先执行 'python 脚本名.py --step draw' 和 "
-                f"'python 脚本名.py --step compile' 生成，当前期望路径：{args.graph_file}"
+                f"'python 脚本名.py --step compile' 生成，当前期望路径：{graph_file}"
             )
 
         # 初始化Chempiler并执行流程
-        print(f"[第三步：执行] 使用Graph文件 {args.graph_file} 启动流程")
+        print(f"[第三步：执行] 使用Graph文件 {graph_file} 启动流程")
         platform_controller = Chempiler(
             experiment_code="test",
             output_dir=appdirs.user_data_dir("xdl"),
-            graph_file=args.graph_file,
+            graph_file=graph_file,
             simulation=True,  # 模拟模式（可根据需求调整）
             device_modules=[ChemputerAPI],
         )
-        x = XDL(args.xdl_file)
-        x.graph(save=args.graph_file)
+        x = XDL(xdl_file)
+        # Graph文件比XDL新时直接复用，不再重新生成
+        if not graph_is_fresh(xdl_file, graph_file):
+            x.graph(save=graph_file)
         x.prepare_for_execution(
-            graph_file=args.graph_file,
-            interactive=args.interactive,  # 交互模式（用户指定）
+            graph_file=graph_file,
+            interactive=interactive,  # 交互模式（用户指定）
         )
         x.execute(platform_controller)  # 启动执行
         # （注：若Chempiler需要显式调用"执行"方法，需补充，如 platform_controller.run()）
@@ -160,5 +139,77 @@ def main():
         return
 
 
+def main():
+    parser = argparse.ArgumentParser(
+        description="XDL流程分步执行工具（画图/编译/执行）"
+    )
+
+    # 1. 公共参数（所有步骤都可能用到）
+    parser.add_argument(
+        "--xdl_file", default="files/chem_yan1.xdl", type=str, help="输入xdl"
+    )
+    parser.add_argument(
+        "--xdl_files",
+        nargs="+",
+        default=None,
+        type=str,
+        help="批量模式：多个XDL文件，多进程并行处理（Graph文件按各自XDL推导，"
+        "仅compile步骤可用--graph_file共用；不支持--interactive）",
+    )
+    parser.add_argument(
+        "--graph_file",
+        default=None,
+        type=str,
+        help="生成/使用的Graph JSON文件路径（默认：与XDL同目录，后缀替换为.json）",
+    )
+    parser.add_argument(
+        "--interactive",
+        action="store_true",
+        help="编译时启用交互模式（仅编译步骤生效）",
+    )
+
+    # 2. 核心：步骤选择参数（必选，指定执行哪一步）
+    parser.add_argument(
+        "--step",
+        default="run",
+        required=False,
+        choices=["graph", "compile", "run"],
+        help="指定执行的步骤：\n"
+        "graph - 仅生成Graph图（第一步）\n"
+        "compile - 仅编译XDL流程（第二步，需先执行draw生成graph_file）\n"
+        "run - 仅执行编译后的流程（第三步，需先执行compile）",
+    )
+
+    args = parser.parse_args()
+
+    # 批量模式：各XDL文件互不依赖，分发到多个进程并行执行
+    if args.xdl_files:
+        # 子进程的stdin为/dev/null，无法响应交互提示
+        if args.interactive:
+            parser.error("--xdl_files 批量模式不支持 --interactive")
+        # graph/run步骤会写入Graph文件，多个进程共用同一文件会互相覆盖；
+        # 只有只读的compile步骤可以共用
+        if args.graph_file is not None and args.step != "compile":
+            parser.error(
+                "--xdl_files 批量模式下 --graph_file 仅可用于 --step compile"
+                "（graph/run步骤的Graph文件按各自XDL推导）"
+            )
+        with ProcessPoolExecutor() as executor:
+            list(
+                executor.map(
+                    partial(
+                        run_step,
+                        args.step,
+                        graph_file=args.graph_file,
+                        interactive=args.interactive,
+                    ),
+                    args.xdl_files,
+                )
+            )
+        return
+
+    run_step(args.step, args.xdl_file, args.graph_file, args.interactive)
+
+
 if __name__ == "__main__":
     main()
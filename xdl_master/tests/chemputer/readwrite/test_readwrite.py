@@ -5,7 +5,7 @@ import pytest
 
 from xdl import XDL
 from xdl.errors import XDLInvalidSaveFormatError
-from xdl.readwrite.xml_generator import xdl_to_xml_string
+from xdl.readwrite.xml_generator import xdl_to_xml_stream, xdl_to_xml_string
 
 try:
     from chemputerxdl import ChemputerPlatform
@@ -116,3 +116,37 @@ def test_context_removal():
             # Check does not contain the 'context' entry
             xml = xdl_to_xml_string(x)
             assert "context" not in xml
+
+
+@pytest.mark.chemputer
+def test_xml_stream_matches_string(tmp_path):
+    """Test streamed XML output is identical to XML string output."""
+    for f in os.listdir(INTEGRATION_FOLDER):
+        if (f.startswith("orgsyn") or f.startswith("lidocaine")) and f.endswith("xdl"):
+            x = XDL(os.path.join(INTEGRATION_FOLDER, f), platform=ChemputerPlatform)
+            for full_tree in [False, True]:
+                save_path = tmp_path / f
+                with open(save_path, "w") as fd:
+                    xdl_to_xml_stream(
+                        x, fd, full_properties=full_tree, full_tree=full_tree
+                    )
+                assert save_path.read_text() == xdl_to_xml_string(
+                    x, full_properties=full_tree, full_tree=full_tree
+                )
+
+
+@pytest.mark.chemputer
+def test_readwrite_special_characters(tmp_path):
+    """Test reagent attributes containing XML special characters survive a
+    save and reload.
+    """
+    x1 = XDL(
+        os.path.join(INTEGRATION_FOLDER, "lidocaine.xdl"), platform=ChemputerPlatform
+    )
+    name = 'sodium & potassium <"dry">'
+    x1.reagents[0].name = name
+    output_file = str(tmp_path / "lidocaine.xdl")
+    x1.save(output_file)
+    x2 = XDL(output_file, platform=ChemputerPlatform)
+    assert x2.reagents[0].name == name
+    compare_xdls(x1, x2)
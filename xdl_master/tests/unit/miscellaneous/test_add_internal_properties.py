@@ -0,0 +1,96 @@
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from networkx import MultiDiGraph
+
+from xdl.execution.abstract_executor import AbstractXDLExecutor
+from xdl.steps import AbstractBaseStep
+
+#: Vessels passed to ``VesselVolumeStep.on_prepare_for_execution``, in order.
+PREPARED = []
+
+
+class VesselVolumeStep(AbstractBaseStep):
+    """Step with internal property taken from the graph."""
+
+    PROP_TYPES = {
+        "vessel": str,
+        "vessel_max_volume": float,
+    }
+
+    INTERNAL_PROPS = ["vessel_max_volume"]
+
+    def __init__(self, vessel: str, vessel_max_volume: float = None, **kwargs) -> None:
+        super().__init__(locals())
+
+    def on_prepare_for_execution(self, graph: MultiDiGraph) -> None:
+        PREPARED.append(self.vessel)
+        self.vessel_max_volume = graph.nodes[self.vessel]["max_volume"]
+
+    async def execute(
+        self, platform_controller: Any, logger: logging.Logger = None, level: int = 0
+    ) -> bool:
+        return True
+
+
+def make_graph():
+    graph = MultiDiGraph()
+    graph.add_node("reactor", type="reactor", max_volume=100)
+    graph.add_node("filter", type="filter", max_volume=50)
+    return graph
+
+
+@pytest.mark.unit
+def test_add_internal_properties_skip():
+    """Test steps already prepared for the same graph are not prepared again,
+    and are prepared again once the graph or the step changes.
+    """
+    steps = [VesselVolumeStep("reactor"), VesselVolumeStep("filter")]
+    executor = AbstractXDLExecutor(SimpleNamespace(steps=steps, graph_sha256=None))
+    graph = make_graph()
+
+    PREPARED.clear()
+    executor.add_internal_properties(graph)
+    assert PREPARED == ["reactor", "filter"]
+    assert [step.vessel_max_volume for step in steps] == [100, 50]
+
+    # Nothing changed, nothing to prepare
+    PREPARED.clear()
+    executor.add_internal_properties(graph)
+    assert PREPARED == []
+
+    # Graph attribute edited in place, all steps prepared with new graph
+    graph.nodes["reactor"]["max_volume"] = 200
+    executor.add_internal_properties(graph)
+    assert PREPARED == ["reactor", "filter"]
+    assert [step.vessel_max_volume for step in steps] == [200, 50]
+
+    # Step property changed, only that step prepared again
+    PREPARED.clear()
+    steps[1].vessel = "reactor"
+    executor.add_internal_properties(graph)
+    assert PREPARED == ["reactor"]
+    assert [step.vessel_max_volume for step in steps] == [200, 200]
+
+
+@pytest.mark.unit
+def test_add_internal_properties_given_steps(monkeypatch):
+    """Test given steps, e.g. a single step built to be executed straight away,
+    are always prepared without hashing the graph.
+    """
+
+    def graph_hash(graph=None):
+        raise AssertionError("graph hashed")
+
+    executor = AbstractXDLExecutor()
+    monkeypatch.setattr(executor, "_graph_hash", graph_hash)
+    graph = make_graph()
+    step = VesselVolumeStep("reactor")
+
+    PREPARED.clear()
+    executor.add_internal_properties(graph, steps=[step])
+    executor.add_internal_properties(graph, steps=[step])
+    assert PREPARED == ["reactor", "reactor"]
+    assert step.vessel_max_volume == 100
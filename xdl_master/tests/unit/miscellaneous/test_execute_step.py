@@ -0,0 +1,80 @@
+import asyncio
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from xdl.steps import AbstractBaseStep, Step
+
+
+class RecordStep(AbstractBaseStep):
+    """Step that records that it was executed, and raises ``RuntimeError`` if
+    it should fail.
+    """
+
+    PROP_TYPES = {
+        "fail": bool,
+    }
+
+    DEFAULT_PROPS = {
+        "fail": False,
+    }
+
+    def __init__(self, fail: bool = "default", **kwargs) -> None:
+        super().__init__(locals())
+        self.executed = False
+
+    def locks(self, platform_controller: Any) -> list:
+        return []
+
+    async def execute(
+        self, platform_controller: Any, logger: logging.Logger = None, level: int = 0
+    ) -> bool:
+        self.executed = True
+        if self.fail:
+            raise RuntimeError("step failed")
+        return True
+
+
+def execute_step(step, monkeypatch):
+    """Execute step with no deps or locks, failing if ``await_requirements``
+    is entered.
+    """
+
+    def await_requirements(*args, **kwargs):
+        raise AssertionError("await_requirements entered")
+
+    monkeypatch.setattr(Step, "await_requirements", await_requirements)
+    platform_controller = SimpleNamespace(_locks={})
+    tracer = []
+    keep_going = asyncio.run(
+        step.execute_step(
+            platform_controller, locks=[], tracer=tracer, step_indexes=[0]
+        )
+    )
+    return keep_going, tracer
+
+
+@pytest.mark.unit
+def test_execute_step_without_requirements(monkeypatch):
+    """Test step with no deps or locks is executed directly and added to the
+    tracer.
+    """
+    step = RecordStep()
+    keep_going, tracer = execute_step(step, monkeypatch)
+    assert keep_going is True
+    assert step.executed
+    assert [step_type for step_type, _ in tracer] == [RecordStep]
+
+
+@pytest.mark.unit
+def test_execute_step_without_requirements_fails(monkeypatch, caplog):
+    """Test failure of step with no deps or locks is logged and raised, as it
+    is for steps that wait for their requirements.
+    """
+    step = RecordStep(fail=True)
+    with caplog.at_level(logging.ERROR), pytest.raises(RuntimeError):
+        execute_step(step, monkeypatch)
+    assert step.executed
+    assert "Step failed" in caplog.text
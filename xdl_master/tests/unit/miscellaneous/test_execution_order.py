@@ -0,0 +1,139 @@
+import asyncio
+import collections
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from xdl.execution.abstract_executor import AbstractXDLExecutor
+from xdl.steps import AbstractBaseStep
+
+#: Names of executed ``ReactorStep`` steps and ``LockedStep`` start and end
+#: events, in the order they happened.
+EXECUTED = []
+
+
+class ReactorStep(AbstractBaseStep):
+    """Step that needs the reactor lock while it executes."""
+
+    PROP_TYPES = {
+        "label": str,
+    }
+
+    def __init__(self, label: str, **kwargs) -> None:
+        super().__init__(locals())
+
+    def locks(self, platform_controller: Any) -> list:
+        return ["reactor"]
+
+    async def execute(
+        self, platform_controller: Any, logger: logging.Logger = None, level: int = 0
+    ) -> bool:
+        EXECUTED.append(self.label)
+        await asyncio.sleep(0)
+        return True
+
+
+class LockedStep(AbstractBaseStep):
+    """Step that needs the given comma separated locks while it executes, and
+    records when it starts and ends.
+    """
+
+    PROP_TYPES = {
+        "label": str,
+        "lock_names": str,
+    }
+
+    def __init__(self, label: str, lock_names: str, **kwargs) -> None:
+        super().__init__(locals())
+
+    def locks(self, platform_controller: Any) -> list:
+        return self.lock_names.split(",")
+
+    async def execute(
+        self, platform_controller: Any, logger: logging.Logger = None, level: int = 0
+    ) -> bool:
+        EXECUTED.append(f"start {self.label}")
+        await asyncio.sleep(0.01)
+        EXECUTED.append(f"end {self.label}")
+        return True
+
+
+def execute(steps, locks=("reactor",)):
+    """Execute steps with the base executor and a simulated platform
+    controller declaring the given locks.
+    """
+    xdl_obj = SimpleNamespace(
+        steps=steps,
+        compiled=False,
+        graph_sha256=None,
+        task_groups=collections.defaultdict(list),
+        human_readable=lambda: "",
+    )
+    executor = AbstractXDLExecutor(xdl_obj)
+    executor._prepared_for_execution = True
+
+    async def run():
+        declared_locks = {lock: asyncio.Lock() for lock in locks}
+        platform_controller = SimpleNamespace(_locks=declared_locks)
+        await executor.execute(platform_controller, interactive=False)
+        assert platform_controller._locks is declared_locks
+        assert list(declared_locks) == list(locks)
+
+    EXECUTED.clear()
+    asyncio.run(run())
+    return list(EXECUTED)
+
+
+@pytest.mark.unit
+def test_lock_contended_queues_run_in_procedure_order():
+    """Test steps in different queues contending for the same lock acquire it
+    in procedure order, even when a later queue has a longer chain of steps.
+    Steps only queue for the lock once their dependencies are done, so "a2"
+    runs after "c1".
+    """
+    steps = [
+        ReactorStep("b1", queue="b"),
+        ReactorStep("a1", queue="a"),
+        ReactorStep("a2", queue="a"),
+        ReactorStep("c1", queue="c"),
+    ]
+    assert execute(steps) == ["b1", "a1", "c1", "a2"]
+
+
+@pytest.mark.unit
+def test_undeclared_lock():
+    """Test step requiring a lock not declared by the platform controller
+    raises KeyError, rather than silently getting a lock of its own.
+    """
+    with pytest.raises(KeyError):
+        execute([ReactorStep("a1")], locks=("filter",))
+
+
+@pytest.mark.unit
+def test_steps_contending_for_lock():
+    """Test two steps contending for the same lock never execute at the same
+    time.
+    """
+    steps = [
+        LockedStep("a", "reactor", queue="a"),
+        LockedStep("b", "reactor", queue="b"),
+    ]
+    assert execute(steps) == ["start a", "end a", "start b", "end b"]
+
+
+@pytest.mark.unit
+def test_locks_acquired_together():
+    """Test step waiting for one of its locks doesn't hold its other locks
+    while it waits, so steps needing only those locks can still execute.
+    """
+    steps = [
+        LockedStep("a", "reactor", queue="a"),
+        LockedStep("b", "reactor,filter", queue="b"),
+        LockedStep("c", "filter", queue="c"),
+    ]
+    executed = execute(steps, locks=("reactor", "filter"))
+    assert executed.index("start c") < executed.index("end a")
+    assert executed.index("start b") > executed.index("end a")
+    assert executed.index("start b") > executed.index("end c")
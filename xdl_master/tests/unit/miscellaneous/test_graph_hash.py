@@ -0,0 +1,113 @@
+import asyncio
+import collections
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from networkx import MultiDiGraph
+from networkx.readwrite import node_link_graph
+
+from xdl import XDL
+from xdl.errors import XDLExecutionOnDifferentGraphError
+from xdl.execution.abstract_executor import GRAPH_HASH_PREFIXES, AbstractXDLExecutor
+from xdl.platforms.placeholder import PlaceholderExecutor, PlaceholderPlatform
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+FOLDER = os.path.join(HERE, "..", "..", "files")
+LEGACY_XDLEXE = os.path.join(FOLDER, "legacy_graph_hash.xdlexe")
+LEGACY_GRAPH = os.path.join(FOLDER, "Mitsunobu_graph.json")
+
+
+def load_graph(graph_file):
+    with open(graph_file) as fd:
+        data = json.load(fd)
+    try:
+        return node_link_graph(data, directed=True, multigraph=True, edges="links")
+    except TypeError:  # networkx < 3.4
+        return node_link_graph(data, directed=True, multigraph=True)
+
+
+def execute(xdl_obj, graph):
+    """Execute XDLEXE with simulated platform controller for given graph."""
+    xdl_obj.task_groups = collections.defaultdict(list)
+    platform_controller = SimpleNamespace(graph=graph, simulation=True, _locks={})
+    asyncio.run(xdl_obj.executor.execute(platform_controller, interactive=False))
+
+
+def make_graph():
+    graph = MultiDiGraph()
+    graph.add_node("reactor", type="reactor", current_volume=0, max_volume=100)
+    graph.add_node("flask_water", type="flask", chemical="water", max_volume=500)
+    graph.add_edge("flask_water", "reactor", port="(0,0)")
+    return graph
+
+
+@pytest.mark.unit
+def test_graph_hash_attribute_edit():
+    """Test graph hash changes when node or edge attributes are edited in
+    memory, without any nodes or edges being added or removed.
+    """
+    executor = AbstractXDLExecutor()
+    graph = make_graph()
+    original_hash = executor._graph_hash(graph)
+    assert executor._graph_hash(graph) == original_hash
+
+    graph.nodes["reactor"]["max_volume"] = 50
+    node_edit_hash = executor._graph_hash(graph)
+    assert node_edit_hash != original_hash
+
+    graph.edges["flask_water", "reactor", 0]["port"] = "(1,0)"
+    assert executor._graph_hash(graph) not in [original_hash, node_edit_hash]
+
+    # Reverting edits gives back original hash
+    graph.nodes["reactor"]["max_volume"] = 100
+    graph.edges["flask_water", "reactor", 0]["port"] = "(0,0)"
+    assert executor._graph_hash(graph) == original_hash
+
+
+@pytest.mark.unit
+def test_graph_hash_prefix():
+    """Test new graph hashes are prefixed with the algorithm that made them,
+    and that the default hash is fixed for a given graph (doesn't depend on
+    optional packages being installed).
+    """
+    executor = AbstractXDLExecutor()
+    graph_hash = executor._graph_hash(make_graph())
+    prefix = GRAPH_HASH_PREFIXES[executor.graph_hash_algorithm]
+    assert graph_hash.startswith(prefix)
+    assert graph_hash == (
+        "sha256:94c3ef8c33670b9cb28ac9b071549099f7b0e80cc9d81d58251dc42525a57484"
+    )
+
+
+@pytest.mark.unit
+def test_legacy_xdlexe_graph_hash():
+    """Test XDLEXE with unprefixed (legacy) graph hash executes on the graph
+    it was compiled with, and not on a different graph.
+    """
+    x = XDL(LEGACY_XDLEXE, platform=PlaceholderPlatform)
+    execute(x, load_graph(LEGACY_GRAPH))
+    assert x.executor._prepared_for_execution
+
+    x = XDL(LEGACY_XDLEXE, platform=PlaceholderPlatform)
+    graph = load_graph(LEGACY_GRAPH)
+    graph.nodes["reactor"]["max_volume"] += 1
+    with pytest.raises(XDLExecutionOnDifferentGraphError):
+        execute(x, graph)
+
+
+class OverrideExecutor(PlaceholderExecutor):
+    def _graph_hash(self, graph=None):
+        return super()._graph_hash(graph)
+
+
+@pytest.mark.unit
+def test_graph_hash_override():
+    """Test execution works with executors overriding ``_graph_hash`` with the
+    documented ``(self, graph=None)`` signature.
+    """
+    x = XDL(LEGACY_XDLEXE, platform=PlaceholderPlatform)
+    x.executor = OverrideExecutor(x)
+    execute(x, load_graph(LEGACY_GRAPH))
+    assert x.executor._prepared_for_execution
@@ -0,0 +1,32 @@
+import pytest
+
+from xdl.errors import XDLDuplicateParameterID
+from xdl.parameters import Parameter
+from xdl.readwrite.xml_interpreter import _parameters_by_id, map_xdl_to_parameter
+
+
+@pytest.mark.unit
+def test_map_xdl_to_parameter():
+    """Test mapping of XDL values to global parameter values."""
+    parameters = _parameters_by_id(
+        [
+            Parameter(id="volume", parameter_type="volume", value="10 mL"),
+            Parameter(id="time", parameter_type="time", value="5 min"),
+        ]
+    )
+
+    assert map_xdl_to_parameter("time", parameters) == "5 min"
+    assert map_xdl_to_parameter("temp", parameters) is None
+    assert map_xdl_to_parameter("time", {}) is None
+
+
+@pytest.mark.unit
+def test_duplicate_parameter_ids():
+    """Test duplicate parameter ids raise an error when indexed."""
+    with pytest.raises(XDLDuplicateParameterID):
+        _parameters_by_id(
+            [
+                Parameter(id="volume", parameter_type="volume", value="10 mL"),
+                Parameter(id="volume", parameter_type="volume", value="20 mL"),
+            ]
+        )
@@ -0,0 +1,57 @@
+import logging
+from typing import Any
+
+import pytest
+from networkx import MultiDiGraph
+
+from xdl.execution.abstract_executor import AbstractXDLExecutor
+from xdl.steps import AbstractBaseStep
+from xdl.steps.special.async_step import Async
+
+#: Labels of ``CheckedStep`` steps whose sanity checks were run, in order.
+CHECKED = []
+
+
+class CheckedStep(AbstractBaseStep):
+    """Step recording when its sanity checks are run."""
+
+    PROP_TYPES = {
+        "label": str,
+    }
+
+    def __init__(self, label: str, **kwargs) -> None:
+        super().__init__(locals())
+
+    def sanity_checks(self, graph: MultiDiGraph) -> list:
+        CHECKED.append(self.label)
+        return []
+
+    async def execute(
+        self, platform_controller: Any, logger: logging.Logger = None, level: int = 0
+    ) -> bool:
+        return True
+
+
+def perform_sanity_checks(steps):
+    CHECKED.clear()
+    AbstractXDLExecutor().perform_sanity_checks(steps, MultiDiGraph())
+    return list(CHECKED)
+
+
+@pytest.mark.unit
+def test_sanity_checks_run_once_per_identical_step():
+    """Test identical steps only run sanity checks once, and different steps
+    each run them.
+    """
+    assert perform_sanity_checks([CheckedStep("a"), CheckedStep("a")]) == ["a"]
+    assert perform_sanity_checks([CheckedStep("a"), CheckedStep("b")]) == ["a", "b"]
+
+
+@pytest.mark.unit
+def test_sanity_checks_steps_with_children():
+    """Test steps with children are never skipped as identical, as their
+    children can differ.
+    """
+    assert Async(CheckedStep("a"))._sanity_key() is None
+    steps = [Async(CheckedStep("a")), Async(CheckedStep("b"))]
+    assert perform_sanity_checks(steps) == ["a", "b"]
@@ -0,0 +1,51 @@
+import os
+
+import pytest
+
+from xdl.readwrite import xml_interpreter
+from xdl.readwrite.xml_interpreter import _parse_xdl_file
+
+XDL_TEMPLATE = """<XDL>
+<Blueprint id="{bp_id}">
+    <Procedure></Procedure>
+</Blueprint>
+</XDL>
+"""
+
+
+def write_xdl(path, bp_id):
+    path.write_text(XDL_TEMPLATE.format(bp_id=bp_id))
+    return str(path)
+
+
+def blueprint_ids(xdl_file):
+    xdl_tree = _parse_xdl_file(xdl_file, os.stat(xdl_file))
+    return [element.get("id") for element in xdl_tree.iter("Blueprint")]
+
+
+@pytest.mark.unit
+def test_modified_xdl_file_reread(tmp_path):
+    """Test XDL files modified since they were parsed are parsed again."""
+    xdl_file = write_xdl(tmp_path / "bp.xdl", "first")
+    assert blueprint_ids(xdl_file) == ["first"]
+
+    write_xdl(tmp_path / "bp.xdl", "second_blueprint")
+    assert blueprint_ids(xdl_file) == ["second_blueprint"]
+
+
+@pytest.mark.unit
+def test_xdl_tree_cache_bounded(tmp_path):
+    """Test parsed XDL file cache never holds more than its maximum size, and
+    drops least recently used files first.
+    """
+    cache_size = xml_interpreter._XDL_TREE_CACHE_SIZE
+    first_file = write_xdl(tmp_path / "bp_first.xdl", "first")
+    blueprint_ids(first_file)
+    for i in range(cache_size + 5):
+        blueprint_ids(write_xdl(tmp_path / f"bp_{i}.xdl", f"bp_{i}"))
+        # Keep first file most recently used
+        blueprint_ids(first_file)
+        assert len(xml_interpreter._XDL_TREE_CACHE) <= cache_size
+
+    assert first_file in xml_interpreter._XDL_TREE_CACHE
+    assert str(tmp_path / "bp_0.xdl") not in xml_interpreter._XDL_TREE_CACHE
@@ -0,0 +1,110 @@
+import os
+import xml.etree.ElementTree as ET  # noqa: DUO107,N817 # nosec B405
+
+import pytest
+
+from xdl import XDL
+from xdl.platforms.placeholder import PlaceholderPlatform
+from xdl.readwrite.xml_generator import (
+    _get_element_xdl_string,
+    _get_xdl_string,
+    xdl_to_xml_string,
+)
+
+HERE = os.path.abspath(os.path.dirname(__file__))
+FILES = os.path.join(HERE, "..", "..", "files")
+
+ATTR_VALUES = [
+    "water",
+    "sodium & potassium",
+    "<1 mL",
+    'the "dry" flask',
+    "it's > 5 °C",
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("val", ATTR_VALUES)
+def test_element_attr_escaping(val):
+    """Test attribute values containing XML special characters are escaped,
+    so the written XML can be parsed back to the same values.
+    """
+    element = ET.Element("Reagent", {"id": "reagent", "name": val})
+    ET.SubElement(element, "Add", {"reagent": val})
+    parsed = ET.fromstring(_get_element_xdl_string(element))
+    assert parsed.attrib == {"id": "reagent", "name": val}
+    assert parsed[0].attrib == {"reagent": val}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("val", ATTR_VALUES)
+def test_synthesis_attr_escaping(val):
+    """Test ``<Synthesis>`` attribute values are escaped."""
+    xdltree = ET.Element("Synthesis", {"id": "synth", "graph_sha256": val})
+    ET.SubElement(xdltree, "Hardware")
+    xdl_str = _get_xdl_string(xdltree)
+    synthesis = ET.fromstring(xdl_str.split("\n", 1)[1]).find("Synthesis")
+    assert synthesis.attrib == {"id": "synth", "graph_sha256": val}
+
+
+@pytest.mark.unit
+def test_plain_attrs_unchanged():
+    """Test attribute values without special characters are written as is."""
+    element = ET.Element("Reagent", {"id": "water", "name": "distilled water"})
+    assert _get_element_xdl_string(element) == (
+        '<Reagent\n  id="water"\n  name="distilled water" />\n'
+    )
+
+
+def procedure_tree(xdl_obj, full_tree):
+    """Write XDL object as xdl or xdlexe and return parsed ``<Procedure>``."""
+    xml = xdl_to_xml_string(xdl_obj, full_properties=full_tree, full_tree=full_tree)
+    return ET.fromstring(xml.split("\n", 1)[1]).find("Synthesis/Procedure")
+
+
+@pytest.mark.unit
+def test_blueprint_step_xml():
+    """Test blueprint steps are written with their declared properties in xdl
+    files, and replaced by their steps in xdlexe files.
+    """
+    x = XDL(
+        os.path.join(FILES, "super_simple_blueprint_ALC3.xdl"),
+        platform=PlaceholderPlatform,
+    )
+    procedure = procedure_tree(x, full_tree=False)
+    assert [step.tag for step in procedure] == ["Add", "Add_Liquids"]
+    assert procedure[1].attrib == {
+        "liquid_1": "water",
+        "liquid_2": "acetonitrile_water",
+        "reactor_1": "reactor_01",
+        "reactor_2": "reactor_02",
+    }
+
+    procedure = procedure_tree(x, full_tree=True)
+    assert [step.tag for step in procedure] == ["Add", "Add", "Add", "Add", "Wait"]
+
+
+@pytest.mark.unit
+def test_blueprint_step_xml_unset_props():
+    """Test blueprint steps that don't set every reagent or parameter of the
+    blueprint can be written, leaving out the unset properties.
+    """
+    x = XDL(
+        os.path.join(FILES, "parameter_resolution_no_param_value.xdl"),
+        platform=PlaceholderPlatform,
+    )
+    procedure = procedure_tree(x, full_tree=False)
+    assert [step.tag for step in procedure] == [
+        "Cyclic_Mitsunobu",
+        "Cyclic_Mitsunobu",
+        "Wait",
+    ]
+    for step in procedure[:2]:
+        assert "precipitate_volume" not in step.attrib
+        assert step.get("reagent") == "Z-Hyp-OH"
+    assert procedure[0].get("reaction_time") == "8 h"
+    assert procedure[1].get("reaction_time") == "16 h"
+
+    procedure = procedure_tree(x, full_tree=True)
+    assert "Cyclic_Mitsunobu" not in {step.tag for step in procedure}
+    assert procedure[-1].tag == "Wait"
@@ -0,0 +1,86 @@
+import xml.etree.ElementTree as ET  # noqa: DUO107,N817 # nosec B405
+
+import pytest
+
+from xdl.readwrite.xml_interpreter import (
+    metadata_from_xdl,
+    synthesis_attrs_from_xdl,
+)
+
+XDL1 = """<Synthesis id="synth" graph_sha256="abc">
+<Metadata product="lidocaine" />
+<Hardware>
+    <Component id="reactor" type="reactor" />
+</Hardware>
+<Reagents>
+    <Reagent id="water" />
+</Reagents>
+<Procedure>
+    <Add vessel="reactor" reagent="water" volume="10 mL" />
+</Procedure>
+</Synthesis>
+"""
+
+XDL2 = """<XDL>
+<Blueprint id="bp">
+    <Parameters>
+        <Parameter id="param" type="volume" value="5 mL" />
+    </Parameters>
+    <Procedure></Procedure>
+</Blueprint>
+<Synthesis id="synth" graph_sha256="abc">
+    <Metadata product="lidocaine" />
+    <Hardware>
+        <Component id="reactor" type="reactor" />
+    </Hardware>
+    <Procedure></Procedure>
+</Synthesis>
+</XDL>
+"""
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("xdl_str", [XDL1, XDL2])
+def test_synthesis_attrs(xdl_str):
+    """Test Synthesis attributes are read from the ``<Synthesis>`` element
+    only, not from whichever element in the document came last.
+    """
+    for xdl_tree in [ET.fromstring(xdl_str), ET.ElementTree(ET.fromstring(xdl_str))]:
+        assert synthesis_attrs_from_xdl(xdl_tree) == {
+            "graph_sha256": "abc",
+            "id": "synth",
+        }
+
+
+@pytest.mark.unit
+def test_synthesis_attrs_missing():
+    """Test no attributes are returned when there is no ``<Synthesis>``."""
+    xdl_tree = ET.fromstring('<XDL><Blueprint id="bp" /></XDL>')
+    assert synthesis_attrs_from_xdl(xdl_tree) == {}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("xdl_str", [XDL1, XDL2])
+def test_metadata(xdl_str):
+    """Test ``<Metadata>`` is found in XDL1 and XDL2 files, including when a
+    ``<Blueprint>`` comes before ``<Synthesis>``.
+    """
+    assert metadata_from_xdl(ET.fromstring(xdl_str)).product == "lidocaine"
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "xdl_str",
+    [
+        "<Synthesis />",
+        "<XDL><Synthesis><Procedure /></Synthesis></XDL>",
+        """<XDL><Synthesis><Procedure>
+            <Metadata product="lidocaine" />
+        </Procedure></Synthesis></XDL>""",
+    ],
+)
+def test_metadata_missing(xdl_str):
+    """Test empty Metadata is returned when there is no ``<Metadata>`` at
+    the top two levels of the document.
+    """
+    assert metadata_from_xdl(ET.fromstring(xdl_str)).product is None
@@ -1,4 +1,5 @@
-from typing import Any, Dict, List
+from types import MappingProxyType
+from typing import Any, FrozenSet, Mapping, Tuple
 
 #: XDL version number. Used in header at top of outputted XDL files.
 XDL_VERSION: str = "2.0.0"
@@ -11,7 +12,7 @@ XDL_VERSION: str = "2.0.0"
 CHEMIFY_API_URL: str = "https://api.chemification.com"
 
 #: Chemicals that will be recognised as inert gas.
-INERT_GAS_SYNONYMS: List[str] = ["nitrogen", "n2", "ar", "argon"]
+INERT_GAS_SYNONYMS: FrozenSet[str] = frozenset({"nitrogen", "n2", "ar", "argon"})
 
 #: Chemical name if found in graph to be used as air source.
 AIR: str = "air"
@@ -20,24 +21,30 @@ AIR: str = "air"
 ROOM_TEMPERATURE: int = 25
 
 #: Keywords that if found in reagent name signify that the reagent is aqueous.
-AQUEOUS_KEYWORDS: List[str] = ["water", "aqueous", "acid", " m ", "hydroxide"]
+AQUEOUS_KEYWORDS: FrozenSet[str] = frozenset(
+    {"water", "aqueous", "acid", " m ", "hydroxide"}
+)
 
 #: Attributes of the ``<Synthesis>`` element. This is kind of a relic from when
 #: there were multiple attributes that could be included in the ``Synthesis``
 #: tag. Might be sensible to just handle ``graph_sha256`` attribute specifically
 #: rather than have this one element list.
-SYNTHESIS_ATTRS: List[Dict[str, Any]] = [
-    {
-        "name": "graph_sha256",
-        "type": str,
-        "default": "",
-    },
-    {
-        "name": "id",
-        "type": str,
-        "default": "",
-    },
-]
+SYNTHESIS_ATTRS: Tuple[Mapping[str, Any], ...] = (
+    MappingProxyType(
+        {
+            "name": "graph_sha256",
+            "type": str,
+            "default": "",
+        }
+    ),
+    MappingProxyType(
+        {
+            "name": "id",
+            "type": str,
+            "default": "",
+        }
+    ),
+)
 
 #  tags used for root nodes in standard XDL1 XML and XDL2-exclusive XML
 #  with blueprint compatibility
@@ -54,11 +61,13 @@ VESSEL_PROP_TYPE: str = "vessel"
 JSON_PROP_TYPE: str = "json"
 
 #  Sections used for organising steps. These MUST be kept in order
-STEP_SECTIONS = ["Prep", "Reaction", "Purification", "Workup"]
+STEP_SECTIONS: Tuple[str, ...] = ("Prep", "Reaction", "Purification", "Workup")
 
 #  Core attributes that must always be kept up-to-date in XDL Context
 #  container class.
-CORE_CONTEXT_ATTRS = ["reagents", "blueprints", "components", "hardware", "parameters"]
+CORE_CONTEXT_ATTRS: FrozenSet[str] = frozenset(
+    {"reagents", "blueprints", "components", "hardware", "parameters"}
+)
 
 # used by Repeat as an indicator as when to stop
 
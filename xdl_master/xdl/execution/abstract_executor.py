@@ -1,25 +1,84 @@
 import asyncio
 import hashlib
+import json
 import logging
 from abc import ABC
-from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple
 
 from networkx import MultiDiGraph
 from networkx.readwrite import node_link_data
 
+try:
+    from blake3 import blake3
+except ImportError:  # blake3 is optional, only needed for BLAKE3 graph hashes
+    blake3 = None
+
 from xdl_master.xdl.errors import (
     XDLExecutionBeforeCompilationError,
     XDLExecutionOnDifferentGraphError,
+    XDLValueError,
 )
-from xdl_master.xdl.execution.utils import do_sanity_check
-from xdl_master.xdl.steps import NON_RECURSIVE_ABSTRACT_STEPS
-from xdl_master.xdl.steps.base_steps import AbstractDynamicStep, Step
+from xdl_master.xdl.execution.utils import do_sanity_checks
+from xdl_master.xdl.steps.base_steps import Step
 from xdl_master.xdl.utils.logging import get_logger
 
 if False:
     from xdl import XDL
 
+#: Prefix of graph hashes made with each algorithm, so a hash stored in an
+#: XDLEXE file can be verified with the algorithm that made it. Unprefixed
+#: hashes (XDLEXE files written before prefixes were added) are SHA 256 of
+#: ``str(node_link_data(graph))``, see :py:func:`_legacy_graph_hash`.
+GRAPH_HASH_PREFIXES = {"sha256": "sha256:", "blake3": "b3:"}
+
+
+def _canonical_bytes(obj: Any) -> bytes:
+    """Encode graph node / edge record as canonical JSON bytes (sorted keys)
+    for hashing. Values that aren't JSON serializable are encoded as their
+    ``repr``. Always uses the standard library encoder, so the hash of a graph
+    doesn't depend on which optional packages are installed.
+    """
+    return json.dumps(
+        obj, sort_keys=True, default=repr, separators=(",", ":"), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def _legacy_graph_hash(graph: MultiDiGraph) -> str:
+    """Get graph hash in the unprefixed format of older XDLEXE files: SHA 256
+    of ``str(node_link_data(graph))``, with edges under the ``'links'`` key.
+
+    Args:
+        graph (MultiDiGraph): Graph to hash.
+
+    Returns:
+        str: Hash of graph.
+    """
+    try:
+        data = node_link_data(graph, edges="links")
+    except TypeError:  # networkx < 3.4, edges are always under 'links'
+        data = node_link_data(graph)
+    return hashlib.sha256(str(data).encode("utf-8")).hexdigest()
+
+
+def _hash_graph(graph: MultiDiGraph, hasher: Any) -> str:
+    """Feed every node and edge record of graph to hasher in canonical (sorted)
+    order and return the hex digest.
+
+    Args:
+        graph (MultiDiGraph): Graph to hash.
+        hasher (Any): New hash object, e.g. ``hashlib.sha256()``.
+
+    Returns:
+        str: Hex digest of hasher.
+    """
+    records = [_canonical_bytes(node) for node in graph.nodes(data=True)]
+    records.extend(_canonical_bytes(edge) for edge in graph.edges(keys=True, data=True))
+    records.sort()
+    for record in records:
+        hasher.update(record)
+        hasher.update(b"\n")
+    return hasher.hexdigest()
+
 
 class AbstractXDLExecutor(ABC):
     """Abstract class for XDL executor. The main functionality of this class is
@@ -38,12 +97,21 @@ class AbstractXDLExecutor(ABC):
             ``self._xdl`` will be altered to execute on this graph during
             :py:meth`prepare_for_execution`.
         logger (logging.Logger): Logger object for executor to use when logging.
+        _prep_graph_hash (Optional[Tuple[MultiDiGraph, str]]): Graph and its
+            hash for the whole procedure :py:meth:`add_internal_properties`
+            pass in progress, so the graph is only hashed once per pass.
+        graph_hash_algorithm (str): Algorithm used by :py:meth:`_graph_hash` to
+            hash graphs for new XDLEXE files. Key of
+            :py:data:`GRAPH_HASH_PREFIXES`. Defaults to ``'sha256'``, which
+            needs no optional packages to verify.
     """
 
     _prepared_for_execution: bool = False
     _xdl: "XDL" = None
     _graph: MultiDiGraph = None
     logger: logging.Logger = None
+    graph_hash_algorithm: str = "sha256"
+    _prep_graph_hash: Optional[Tuple[MultiDiGraph, str]] = None
 
     def __init__(self, xdl: "XDL" = None) -> None:
         """Initalize ``_xdl`` and ``logger`` member variables."""
@@ -55,9 +123,19 @@ class AbstractXDLExecutor(ABC):
     ####################
 
     def _graph_hash(self, graph: MultiDiGraph = None) -> str:
-        """Get SHA 256 hash of graph. Used to determine whether graph used for
+        """Get hash of graph. Used to determine whether graph used for
         execution is the same as the one used for compilation.
 
+        Hashes are prefixed with the algorithm that made them (see
+        :py:data:`GRAPH_HASH_PREFIXES`). When ``self._xdl`` was loaded from an
+        XDLEXE file, the graph is hashed with the algorithm of the stored hash
+        so the two can be compared, otherwise with
+        :py:attr:`graph_hash_algorithm`.
+
+        Nodes and edges are fed to the hash in a canonical (sorted) order, so
+        the hash does not depend on the order in which they were added to the
+        graph. No intermediate serialization of the whole graph is built.
+
         Recommended to override this basic implementation, as this will give
         you a different hash if the position of nodes change, even if the
         properties and connectivity stays the same.
@@ -67,10 +145,48 @@ class AbstractXDLExecutor(ABC):
 
         Returns:
             str: Hash of graph.
+
+        Raises:
+            ImportError: Stored hash is a BLAKE3 hash but ``blake3`` is not
+                installed.
         """
-        if not graph:
+        if graph is None:
             graph = self._graph
-        return hashlib.sha256(str(node_link_data(graph)).encode("utf-8")).hexdigest()
+
+        algorithm = self._graph_hash_algorithm()
+        if algorithm is None:
+            return _legacy_graph_hash(graph)
+        if algorithm == "blake3":
+            if blake3 is None:
+                raise ImportError(
+                    "blake3 must be installed to check BLAKE3 graph hash."
+                )
+            hasher = blake3()
+        else:
+            hasher = hashlib.sha256()
+        return GRAPH_HASH_PREFIXES[algorithm] + _hash_graph(graph, hasher)
+
+    def _graph_hash_algorithm(self) -> Optional[str]:
+        """Get algorithm :py:meth:`_graph_hash` should use. If ``self._xdl``
+        has a stored graph hash (loaded from XDLEXE) this is the algorithm
+        given by its prefix, otherwise :py:attr:`graph_hash_algorithm`.
+
+        Returns:
+            Optional[str]: Key of :py:data:`GRAPH_HASH_PREFIXES`, or ``None``
+            for the legacy unprefixed hash.
+
+        Raises:
+            XDLValueError: Stored hash has an unknown algorithm prefix.
+        """
+        stored_hash = self._xdl.graph_sha256 if self._xdl is not None else None
+        if not stored_hash:
+            return self.graph_hash_algorithm
+        for algorithm, prefix in GRAPH_HASH_PREFIXES.items():
+            if stored_hash.startswith(prefix):
+                return algorithm
+        if ":" in stored_hash:
+            raise XDLValueError(f'Unknown graph hash algorithm in "{stored_hash}".')
+        return None
 
     def prepare_for_execution(self, graph: MultiDiGraph, **kwargs) -> None:
         """Abstract compile method. Should convert :py:attr:`_xdl` into an
@@ -137,8 +253,9 @@ class AbstractXDLExecutor(ABC):
             graph = self._graph
         if steps is None:
             steps = self._xdl.steps
-        for step in steps:
-            do_sanity_check(graph, step)
+        # Whole procedure checked in one walk, steps of the same type with the
+        # same properties are only checked once
+        do_sanity_checks(graph, steps, set())
 
     def add_internal_properties(
         self, graph: MultiDiGraph = None, steps: List[Step] = None
@@ -149,6 +266,10 @@ class AbstractXDLExecutor(ABC):
         ``on_prepare_for_execution`` method of every step, child step and
         substep in the step list.
 
+        When preparing the whole procedure (``steps`` not given), steps already
+        prepared for the same graph whose properties haven't changed since are
+        skipped. Given steps are always prepared, without hashing the graph.
+
         Args:
             graph (MultiDiGraph): Graph to pass to step
                 ``on_prepare_for_execution`` method.
@@ -158,15 +279,26 @@ class AbstractXDLExecutor(ABC):
         """
         if graph is None:
             graph = self._graph
-        if steps is None:
+        whole_procedure = steps is None
+        if whole_procedure:
             steps = self._xdl.steps
 
         def prep_function(graph, step):
             self.add_internal_properties_to_step(graph, step)
 
-        # Iterate through each step
-        for step in steps:
-            step.register_prep_function(prep_function, graph)
+        # Hash graph once for the whole procedure pass, substeps are prepared by
+        # nested calls with the same graph. Not worth it when preparing given
+        # steps, e.g. a single step built to be executed straight away.
+        outer_call = self._prep_graph_hash is None
+        if outer_call and whole_procedure and graph is not None:
+            self._prep_graph_hash = (graph, self._graph_hash(graph))
+        try:
+            # Iterate through each step
+            for step in steps:
+                step.register_prep_function(prep_function, graph)
+        finally:
+            if outer_call:
+                self._prep_graph_hash = None
 
     def add_internal_properties_to_step(self, graph: MultiDiGraph, step: Step) -> None:
         """Add internal properties to given step and all its substeps and
@@ -179,17 +311,63 @@ class AbstractXDLExecutor(ABC):
                 The step is altered in place, hence no return
                 value.
         """
-        # Prepare the step for execution
-        step.on_prepare_for_execution(graph)
+        # Prepare the step for execution, unless it was already prepared for
+        # this graph and its properties haven't changed since (incremental
+        # compile).
+        graph_hash = self._prep_graph(graph)
+        prep_hash = self._prep_hash(step, graph_hash)
+        if prep_hash is None or prep_hash != step._prep_hash:
+            step.on_prepare_for_execution(graph)
+            # Key of state after preparing, properties have been updated
+            step._prep_hash = self._prep_hash(step, graph_hash)
 
         # Special case for Dynamic steps
-        if isinstance(step, AbstractDynamicStep):
+        if step._is_dynamic:
             step.prepare_for_execution(graph, self)
 
         # Recursive steps, add internal properties to all substeps
-        elif not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
+        elif not step._is_non_recursive:
             self.add_internal_properties(graph, step.steps)
 
+    def _prep_graph(self, graph: MultiDiGraph) -> Optional[str]:
+        """Get hash of graph steps are being prepared with, computed at the
+        start of the whole procedure :py:meth:`add_internal_properties` pass in
+        progress.
+
+        Args:
+            graph (MultiDiGraph): Graph steps are prepared with.
+
+        Returns:
+            Optional[str]: Graph hash, or ``None`` if not in a whole procedure
+            pass with this graph, in which case steps are always prepared.
+        """
+        if self._prep_graph_hash is not None and self._prep_graph_hash[0] is graph:
+            return self._prep_graph_hash[1]
+        return None
+
+    def _prep_hash(self, step: Step, graph_hash: Optional[str]) -> Optional[tuple]:
+        """Get key identifying the state of a step after
+        ``on_prepare_for_execution``: step type, properties (including
+        internal properties) and graph hash. If the key is unchanged since the
+        step was last prepared, preparing it again would have no effect.
+
+        Args:
+            step (Step): Step to get key for.
+            graph_hash (Optional[str]): Hash of graph step is prepared with.
+
+        Returns:
+            Optional[tuple]: Key, or ``None`` if the step can't be keyed (no
+            graph, child steps or unhashable properties).
+        """
+        if graph_hash is None or "children" in step.properties:
+            return None
+        key = (type(step), tuple(sorted(step.properties.items())), graph_hash)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def prepare_dynamic_steps_for_execution(
         self, step: Step, graph: MultiDiGraph
     ) -> None:
@@ -204,12 +382,12 @@ class AbstractXDLExecutor(ABC):
                 execution.
             graph (MultiDiGraph): Graph to use when preparing for execution.
         """
-        if isinstance(step, AbstractDynamicStep):
+        if step._is_dynamic:
             if step.start_block is None:
                 step.prepare_for_execution(graph, self)
             for substep in step.start_block:
                 self.prepare_dynamic_steps_for_execution(substep, graph)
-        elif not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
+        elif not step._is_non_recursive:
             for substep in step.steps:
                 self.prepare_dynamic_steps_for_execution(substep, graph)
 
@@ -270,23 +448,37 @@ class AbstractXDLExecutor(ABC):
         if not self._prepared_for_execution:
             raise XDLExecutionBeforeCompilationError()
 
-        self.logger.info(
-            "Procedure\n"
-            "---------\n\n"
-            f"{self._xdl.human_readable()}\n"  # fmt: skip
-        )
+        # human_readable walks and formats every step, only build it if it will
+        # actually be logged
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(
+                "Procedure\n"
+                "---------\n\n"
+                f"{self._xdl.human_readable()}\n"  # fmt: skip
+            )
 
         task_groups = self._xdl.task_groups
 
-        # create tasks from all steps and schedule them with asyncio
+        # create tasks from all steps and schedule them with asyncio. Tasks are
+        # created in procedure order, so steps waiting on the same locks start
+        # and acquire them in procedure order.
+        all_tasks: List[asyncio.Task] = []
+        # Locks declared by platform controller, the same Lock objects are
+        # reused by every execution. Copied to a plain dict so an unknown lock
+        # name raises KeyError rather than creating a new lock.
+        locks_map = dict(platform_controller._locks)
+        # Steps requiring the same locks share one (read only) locks dict
+        lock_dicts: Dict[tuple, Dict[str, asyncio.Lock]] = {}
         step: Step
         for i, step in enumerate(self._xdl.steps):
             step_indexes = [i]
             deps = step.get_deps(task_groups)
-            step_locks = {
-                lock: platform_controller._locks[lock]
-                for lock in step.locks(platform_controller)
-            }
+            lock_key = tuple(step.locks(platform_controller))
+            step_locks = lock_dicts.get(lock_key)
+            if step_locks is None:
+                step_locks = lock_dicts[lock_key] = {
+                    lock: locks_map[lock] for lock in lock_key
+                }
 
             # Execute step
             task = asyncio.create_task(
@@ -299,22 +491,36 @@ class AbstractXDLExecutor(ABC):
                 )
                 # name=step.name  # python >= 3.8
             )
+            all_tasks.append(task)
             # order tasks by 'queue', any tasks without a queue (None)
             # will be added to the root task queue.
             task_groups[step.queue].append((step, task))
 
-        if task_groups:
-            all_steps, all_tasks = zip(*chain(*task_groups.values()))
-            for task in asyncio.as_completed(all_tasks):
-                keep_going = await task
-                if not keep_going:
-                    # name = (
-                    #     task.get_name()
-                    #     if hasattr(task, "name")
-                    #     else task.__name__
-                    # )  # python >= 3.8
-                    self.logger.warning("Aborted execution.")
-                    # cancel all tasks while aborting
-                    for t in all_tasks:
-                        t.cancel()
-                    break
+        if all_tasks:
+            # Tasks push themselves onto a queue as they finish, so completion
+            # order is consumed without re-polling the pending set.
+            done_queue: asyncio.Queue = asyncio.Queue()
+            for task in all_tasks:
+                task.add_done_callback(done_queue.put_nowait)
+
+            pending = set(all_tasks)
+            try:
+                for _ in range(len(all_tasks)):
+                    task = await done_queue.get()
+                    pending.discard(task)
+                    keep_going = task.result()
+                    if not keep_going:
+                        # name = (
+                        #     task.get_name()
+                        #     if hasattr(task, "name")
+                        #     else task.__name__
+                        # )  # python >= 3.8
+                        self.logger.warning("Aborted execution.")
+                        break
+            finally:
+                # On abort or error cancel only the unfinished tasks, and wait
+                # for them to unwind so no step task outlives execution.
+                for t in pending:
+                    t.cancel()
+                if pending:
+                    await asyncio.gather(*pending, return_exceptions=True)
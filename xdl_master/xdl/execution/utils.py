@@ -1,9 +1,13 @@
+from typing import Iterable, Optional, Set
+
 from networkx import MultiDiGraph
 
-from xdl_master.xdl.steps import NON_RECURSIVE_ABSTRACT_STEPS, AbstractDynamicStep, Step
+from xdl_master.xdl.steps import AbstractDynamicStep, Step
 
 
-def do_sanity_check(graph: MultiDiGraph, step: Step) -> None:
+def do_sanity_check(
+    graph: MultiDiGraph, step: Step, checked: Optional[Set[tuple]] = None
+) -> None:
     """Perform sanity checks defined in step ``sanity_checks`` methods
     on given step, and recursively on all substeps and child steps in given
     step.
@@ -11,28 +15,52 @@ def do_sanity_check(graph: MultiDiGraph, step: Step) -> None:
     Args:
         graph (MultiDiGraph): Graph to pass to ``sanity_checks`` methods.
         step (Step): Step to perform sanity checks for.
+        checked (Set[tuple]): Optional set of :py:meth:`Step._sanity_key` keys
+            of steps that have already passed sanity checks on ``graph``.
+            Steps with a key in this set (and their substeps) are skipped, and
+            keys of steps passing sanity checks are added to it.
+
+    Raises:
+        XDLSanityCheckError: Raised if any sanity check fails.
+    """
+    do_sanity_checks(graph, [step], checked)
+
+
+def do_sanity_checks(
+    graph: MultiDiGraph, steps: Iterable[Step], checked: Optional[Set[tuple]] = None
+) -> None:
+    """Perform sanity checks on all given steps, and all their substeps and
+    child steps, in a single walk of the step tree. See
+    :py:func:`do_sanity_check`.
+
+    Args:
+        graph (MultiDiGraph): Graph to pass to ``sanity_checks`` methods.
+        steps (Iterable[Step]): Steps to perform sanity checks for.
+        checked (Set[tuple]): Optional set of :py:meth:`Step._sanity_key` keys
+            of steps that have already passed sanity checks on ``graph``.
 
     Raises:
         XDLSanityCheckError: Raised if any sanity check fails.
     """
+    # Depth first walk with an explicit stack rather than recursion; steps
+    # are pushed in reverse so they are still checked in procedure order.
+    stack = list(steps)
+    stack.reverse()
+    while stack:
+        step = stack.pop()
+        key = step._sanity_key() if checked is not None else None
+        if key is not None and key in checked:
+            continue
+
+        # Perform step sanity check
+        step.final_sanity_check(graph)
+        if key is not None:
+            checked.add(key)
+
+        # Child steps or substeps of recursive step
+        if "children" in step.properties or not step._is_non_recursive:
+            stack.extend(reversed(step.steps))
 
-    # Perform step sanity check
-    step.final_sanity_check(graph)
-
-    # Iterate through any child steps
-    if "children" in step.properties:
-        for child in step.steps:
-            do_sanity_check(graph, child)
-
-    # Recursive step
-    elif not isinstance(step, NON_RECURSIVE_ABSTRACT_STEPS):
-        # Iterate through substep and perform sanity check
-        for substep in step.steps:
-            do_sanity_check(graph, substep)
-
-    # Dynamic step
-    elif type(step) == AbstractDynamicStep:
-        # Iterate through each substep in the steps current start block
-        for substep in step.start_block:
-            # Sanity check the substep
-            do_sanity_check(graph, substep)
+        # Dynamic step, check each substep in the steps current start block
+        elif type(step) == AbstractDynamicStep:
+            stack.extend(reversed(step.start_block))
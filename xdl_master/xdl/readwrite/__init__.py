@@ -1 +1,4 @@
-from xdl_master.xdl.readwrite.xml_generator import xdl_to_xml_string
+from xdl_master.xdl.readwrite.xml_generator import (
+    xdl_to_xml_stream,
+    xdl_to_xml_string,
+)
@@ -2,9 +2,18 @@ from xdl_master.xdl.errors import XDLError
 
 
 class XDLReadError(XDLError):
-    """Base error class for errors occurring while reading XDL files/strings."""
+    """Base error class for errors occurring while reading XDL files/strings.
 
-    pass
+    Subclasses that don't take any arguments can set the class level ``_msg``
+    string instead of overriding ``__str__``.
+    """
+
+    _msg: str = None
+
+    def __str__(self):
+        if self._msg is not None:
+            return self._msg
+        return super().__str__()
 
 
 class XDLInvalidStepTypeError(XDLReadError):
@@ -62,57 +71,49 @@ class XDLJSONNotBlueprintsAndSynthesis(XDLInvalidJSONError):
 class XDLJSONBlueprintsNotListError(XDLInvalidJSONError):
     """XDL JSON Blueprints section is not an array."""
 
-    def __str__(self):
-        return "Blueprints section should be an array."
+    _msg = "Blueprints section should be an array."
 
 
 class XDLJSONBlueprintsSynthesisNotDictError(XDLInvalidJSONError):
     """XDL JSON Synthesis section is not a dictionary."""
 
-    def __str__(self):
-        return "Synthesis section should be a dictionary."
+    _msg = "Synthesis section should be a dictionary."
 
 
 class XDLJSONMissingHardwareError(XDLInvalidJSONError):
     """XDL JSON is missing hardware section."""
 
-    def __str__(self):
-        return 'XDL JSON is missing "hardware" section.'
+    _msg = 'XDL JSON is missing "hardware" section.'
 
 
 class XDLJSONMissingReagentsError(XDLInvalidJSONError):
     """XDL JSON is missing reagents section."""
 
-    def __str__(self):
-        return 'XDL JSON is missing "reagents" section.'
+    _msg = 'XDL JSON is missing "reagents" section.'
 
 
 class XDLJSONMissingStepsError(XDLInvalidJSONError):
     """XDL JSON is missing steps section."""
 
-    def __str__(self):
-        return 'XDL JSON is missing "steps" section.'
+    _msg = 'XDL JSON is missing "steps" section.'
 
 
 class XDLJSONHardwareNotArrayError(XDLInvalidJSONError):
     """XDL JSON hardware section is not an array."""
 
-    def __str__(self):
-        return "Hardware section should be an array."
+    _msg = "Hardware section should be an array."
 
 
 class XDLJSONReagentsNotArrayError(XDLInvalidJSONError):
     """XDL JSON reagents section is not an array."""
 
-    def __str__(self):
-        return "Reagents section should be an array."
+    _msg = "Reagents section should be an array."
 
 
 class XDLJSONStepsNotArrayError(XDLInvalidJSONError):
     """XDL JSON steps section is not an array."""
 
-    def __str__(self):
-        return "Steps section should be an array."
+    _msg = "Steps section should be an array."
 
 
 class XDLJSONInvalidSectionError(XDLInvalidJSONError):
@@ -129,12 +130,10 @@ class XDLJSONInvalidSectionError(XDLInvalidJSONError):
 class XDLJSONMissingStepNameError(XDLInvalidJSONError):
     """Step missing "name" parameter in XDL JSON."""
 
-    def __str__(self):
-        return 'Step missing "name" parameter in XDL JSON.'
+    _msg = 'Step missing "name" parameter in XDL JSON.'
 
 
 class XDLJSONMissingPropertiesError(XDLInvalidJSONError):
     """Step missing "properties" object in XDL JSON."""
 
-    def __str__(self):
-        return 'XDL element must have "properties" object in XDL JSON.'
+    _msg = 'XDL element must have "properties" object in XDL JSON.'
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import functools
+import io
 import xml.etree.ElementTree as ET  # noqa: DUO107,N817 # nosec B405
+from typing import Any, Callable, Dict, TextIO
+from xml.sax.saxutils import escape  # noqa: DUO107 # nosec B406
 
 from xdl_master.xdl.blueprints import Blueprint
 from xdl_master.xdl.constants import XDL_VERSION
@@ -8,13 +12,41 @@ from xdl_master.xdl.hardware import Hardware
 from xdl_master.xdl.metadata import Metadata
 from xdl_master.xdl.reagents import Reagent
 from xdl_master.xdl.steps import Step
-from xdl_master.xdl.utils.misc import format_property
+from xdl_master.xdl.utils.misc import (
+    format_mass,
+    format_pressure,
+    format_property,
+    format_stir_rpm,
+    format_temp,
+    format_time,
+    format_volume,
+)
+from xdl_master.xdl.utils.prop_limits import (
+    MASS_PROP_LIMIT,
+    PRESSURE_PROP_LIMIT,
+    ROTATION_SPEED_PROP_LIMIT,
+    TEMP_PROP_LIMIT,
+    TIME_PROP_LIMIT,
+    VOLUME_PROP_LIMIT,
+    PropLimit,
+)
 from xdl_master.xdl.utils.sanitisation import convert_val_to_std_units
 from xdl_master.xdl.utils.steps import steps_from_step_templates
 
 if False:
     from xdl import XDL
 
+#: Unit formatters for quantity prop limits, matching the branches taken by
+#: ``format_property`` for these limits when ``human_readable=False``.
+_LIMIT_FORMATTERS: Dict[PropLimit, Callable[[Any], str]] = {
+    TIME_PROP_LIMIT: format_time,
+    VOLUME_PROP_LIMIT: format_volume,
+    MASS_PROP_LIMIT: format_mass,
+    TEMP_PROP_LIMIT: format_temp,
+    PRESSURE_PROP_LIMIT: format_pressure,
+    ROTATION_SPEED_PROP_LIMIT: format_stir_rpm,
+}
+
 
 def xdl_to_xml_string(
     xdl_obj: XDL,
@@ -36,8 +68,49 @@ def xdl_to_xml_string(
     Returns:
         str: Pretty printed XML string of procedure.
     """
-    xml_tree = get_xdl_tree(xdl_obj, full_properties, full_tree, graph_hash)
-    return _get_xdl_string(xdltree=xml_tree)
+    out = io.StringIO()
+    xdl_to_xml_stream(xdl_obj, out, full_properties, full_tree, graph_hash)
+    return out.getvalue()
+
+
+def xdl_to_xml_stream(
+    xdl_obj: XDL,
+    fp: TextIO,
+    full_properties: bool = False,
+    full_tree: bool = False,
+    graph_hash: str = None,
+) -> None:
+    """Write given XDL object as XML to text stream. Output is the same as
+    :func:`xdl_to_xml_string`, but the procedure is written one step at a time
+    rather than building the XML tree of the whole procedure first, so memory
+    use is bounded by the largest step tree when writing xdlexe files.
+
+    Args:
+        xdl_obj (XDL): XDL object to write as XML.
+        fp (TextIO): Object with a ``write`` method to write XML to, e.g. open
+            text file.
+        full_properties (bool): If ``True`, all properties will be written.
+            If ``False`` only mandatory, non default values and always write
+            properties will be written.
+        full_tree (bool): If ``True``, full step tree will be written as is the
+            case in xdlexe files.
+        graph_hash (str): Hash of graph to include in xdlexe files.
+    """
+    # Metadata, Hardware and Reagents sections are small, build them as a tree.
+    xdltree = ET.Element("Synthesis")
+    if graph_hash:
+        xdltree.attrib["graph_sha256"] = graph_hash
+    _append_metadata(xdltree, xdl_obj.metadata)
+    _append_hardware_tree(xdltree, xdl_obj.hardware)
+    _append_reagents_tree(xdltree, xdl_obj.reagents)
+
+    _write_xdl(
+        xdltree,
+        fp,
+        write_procedure=lambda out: _write_procedure(
+            xdl_obj, out, full_properties=full_properties, full_tree=full_tree
+        ),
+    )
 
 
 def step_to_xml_string(
@@ -117,14 +190,10 @@ def _append_metadata(xdltree: ET.ElementTree, metadata: Metadata) -> None:
         xdltree (ET.ElementTree): Full XDL XML tree to add hardware to.
         metadata (Metadata): Metadawta to add to XML tree.
     """
-    props = metadata.properties
+    attrib = {k: v for k, v in metadata.properties.items() if v}
     # Metadata used
-    if any(props.values()):
-        metadata_tree = ET.Element("Metadata")
-        for k, v in props.items():
-            if v:
-                metadata_tree.attrib[k] = v
-        xdltree.append(metadata_tree)
+    if attrib:
+        ET.SubElement(xdltree, "Metadata", attrib)
 
 
 def _append_hardware_tree(xdltree: ET.ElementTree, hardware: Hardware) -> None:
@@ -134,19 +203,20 @@ def _append_hardware_tree(xdltree: ET.ElementTree, hardware: Hardware) -> None:
         xdltree (ET.ElementTree): Full XDL XML tree to add hardware to.
         hardware (Hardware): Hardware to add to XML tree.
     """
-    hardware_tree = ET.Element("Hardware")
+    hardware_tree = ET.SubElement(xdltree, "Hardware")
     for component in hardware:
-        component_tree = ET.Element("Component")
-        for prop in component.PROP_TYPES:
-            val = component.properties[prop]
-            if val is not None:
-                if prop == "component_type":
-                    component_tree.attrib["type"] = str(val)
-                # Don't write empty comment field.
-                elif val:
-                    component_tree.attrib[prop] = str(val)
-        hardware_tree.append(component_tree)
-    xdltree.append(hardware_tree)
+        props = component.properties
+        # Don't write empty comment field.
+        ET.SubElement(
+            hardware_tree,
+            "Component",
+            {
+                "type" if prop == "component_type" else prop: str(props[prop])
+                for prop in component.PROP_TYPES
+                if props[prop] is not None
+                and (props[prop] or prop == "component_type")
+            },
+        )
 
 
 def _append_reagents_tree(xdltree: ET.ElementTree, reagents: list[Reagent]) -> None:
@@ -156,15 +226,14 @@ def _append_reagents_tree(xdltree: ET.ElementTree, reagents: list[Reagent]) -> N
         xdltree (ET.ElementTree): Full XDL XML tree to add reagents to.
         reagents (List[Reagent]): Reagents to add to XML tree.
     """
-    reagents_tree = ET.Element("Reagents")
+    reagents_tree = ET.SubElement(xdltree, "Reagents")
     for reagent in reagents:
-        reagent_tree = ET.Element("Reagent")
-        for prop in reagent.PROP_TYPES:
-            val = reagent.properties[prop]
-            if val:
-                reagent_tree.attrib[prop] = str(val)
-        reagents_tree.append(reagent_tree)
-    xdltree.append(reagents_tree)
+        props = reagent.properties
+        ET.SubElement(
+            reagents_tree,
+            "Reagent",
+            {prop: str(props[prop]) for prop in reagent.PROP_TYPES if props[prop]},
+        )
 
 
 def _append_procedure_tree(
@@ -184,43 +253,92 @@ def _append_procedure_tree(
         full_tree (bool): If ``True``, full step tree will be written as is the
             case in xdlexe files.
     """
-    sections = {k: v for k, v in xdl_obj.sections.items() if k != "no_section"}
-    procedure_tree = ET.Element("Procedure")
-    section_trees = {section.capitalize(): None for section in sections}
+    procedure_tree = ET.SubElement(xdltree, "Procedure")
+    section_trees, uuid_to_section = _get_procedure_sections(xdl_obj)
 
     for step in xdl_obj.steps:
-        step_tree = _get_step_tree(
+        step_trees = _get_step_tree(
             step, full_properties=full_properties, full_tree=full_tree
         )
         # XDLEXE, don't worry about procedure sections.
         if full_tree:
-            procedure_tree.extend([*step_tree])
+            procedure_tree.extend(step_trees)
 
         # Just XDL, generate with procedure sections
         else:
-            for section, section_steps in sections.items():
-                section = section.capitalize()
-                if step.uuid in section_steps:
-                    if section_trees[section] is None:
-                        section_trees[section] = ET.Element(section)
-                    section_trees[section].extend([*step_tree])
-                    break
-            else:
+            section = uuid_to_section.get(step.uuid)
+            if section is None:
                 # step is no_section
-                procedure_tree.extend([*step_tree])
+                procedure_tree.extend(step_trees)
+            else:
+                if section_trees[section] is None:
+                    section_trees[section] = ET.Element(section)
+                section_trees[section].extend(step_trees)
 
     for _section, section_tree in section_trees.items():
         if section_tree is not None:
             procedure_tree.append(section_tree)
-    xdltree.append(procedure_tree)
+
+
+def _get_procedure_sections(xdl_obj: XDL) -> tuple[dict, dict]:
+    """Get procedure section names of XDL object, and map of step uuids to
+    section name so each step can be placed with one lookup.
+
+    Args:
+        xdl_obj (XDL): XDL object to get procedure sections of.
+
+    Returns:
+        Tuple[Dict[str, None], Dict[str, str]]: ``(sections, uuid_to_section)``
+        ``sections`` has capitalized section names as keys, in order, with
+        ``None`` values.
+    """
+    sections = {k: v for k, v in xdl_obj.sections.items() if k != "no_section"}
+
+    # First section listing a uuid wins.
+    uuid_to_section = {}
+    for section, section_steps in sections.items():
+        section = section.capitalize()
+        for uuid in section_steps:
+            uuid_to_section.setdefault(uuid, section)
+    return {section.capitalize(): None for section in sections}, uuid_to_section
 
 
 def _get_step_tree(
     step: Step,
     full_properties: bool = False,
     full_tree: bool = False,
+) -> list[ET.Element]:
+    """Get XML trees associated with given step.
+
+    Args:
+        step (Step): Step to generate XML tree for.
+        full_properties (bool): If ``True``, all properties will be written.
+            If ``False`` only mandatory, non default values and always write
+            properties will be written.
+        full_tree (bool): If ``True``, full step tree will be written as is the
+            case in xdlexe files.
+
+    Returns:
+        List[ET.Element]: ``[step_tree]`` for normal steps and for blueprints
+        in xdl files. In xdlexe files blueprints are not written themselves,
+        so for these the trees of their steps are returned.
+    """
+    if isinstance(step, Blueprint):
+        return _get_blueprint_trees(
+            step, full_properties=full_properties, full_tree=full_tree
+        )
+    return [
+        _get_step_element(step, full_properties=full_properties, full_tree=full_tree)
+    ]
+
+
+def _get_step_element(
+    step: Step,
+    full_properties: bool = False,
+    full_tree: bool = False,
 ) -> ET.Element:
-    """Get XML tree associated with given step.
+    """Get XML tree of given step. Should not be used for blueprints, use
+    :func:`_get_step_tree` to dispatch.
 
     Args:
         step (Step): Step to generate XML tree for.
@@ -229,82 +347,190 @@ def _get_step_tree(
             properties will be written.
         full_tree (bool): If ``True``, full step tree will be written as is the
             case in xdlexe files.
+
+    Returns:
+        ET.Element: XML tree of step.
     """
-    root_node = ET.Element("root")
+    step_tree = ET.Element(step.name)
 
-    if isinstance(step, Blueprint):
-        step_tree = root_node
-    else:
-        step_node = ET.Element(step.name)
-        root_node.append(step_node)
-        step_tree = step_node
+    props = step.properties
+    prop_limits = step.PROP_LIMITS
+    default_props = step.DEFAULT_PROPS
+    internal_props, always_write = _write_filter_sets(type(step))
 
     children = False
-    for prop in step.PROP_TYPES:
+    for prop, prop_type in step.PROP_TYPES.items():
+        val = props[prop]
+
         # Find out if step has children, and if they should be written (xdlexe)
-        if prop == "children" and step.properties[prop] and full_properties:
-            children = True
+        if prop == "children":
+            if val and full_properties:
+                children = True
+
+        # Skip unset and internal properties without calling
+        # _add_step_property, unless writing all properties.
+        elif not full_properties and (val is None or prop in internal_props):
+            continue
 
         # Add property to step tree
         _add_step_property(
-            step_tree, step, prop, full_properties=full_properties, full_tree=full_tree
+            step_tree,
+            prop,
+            val,
+            prop_type,
+            prop_limits,
+            default_props,
+            internal_props,
+            always_write,
+            full_properties=full_properties,
+            full_tree=full_tree,
         )
 
-    if full_tree:
-        # children already added in _add_step_property
-        if children:
-            pass
-        else:
-            for substep in step.steps:
-                subtree = _get_step_tree(
-                    substep,
-                    full_properties=full_properties,
-                    full_tree=full_tree,
+    # children already added in _add_step_property
+    if full_tree and not children:
+        for substep in step.steps:
+            step_tree.extend(
+                _get_step_tree(
+                    substep, full_properties=full_properties, full_tree=full_tree
                 )
-                step_tree.extend([*subtree])
-    return root_node
+            )
+    return step_tree
+
+
+def _get_blueprint_trees(
+    blueprint: Blueprint,
+    full_properties: bool = False,
+    full_tree: bool = False,
+) -> list[ET.Element]:
+    """Get XML trees of given blueprint step. In xdl files the blueprint step
+    is written with its declared properties, in xdlexe files its steps are
+    written in its place.
+
+    Blueprint properties are inferred from the blueprint's reagents, hardware
+    and parameters, so not all of them are necessarily set.
+
+    Args:
+        blueprint (Blueprint): Blueprint to generate XML trees for.
+        full_properties (bool): If ``True``, all set properties will be
+            written. If ``False`` only properties different to the blueprint's
+            defaults will be written.
+        full_tree (bool): If ``True``, full step tree will be written as is the
+            case in xdlexe files.
+
+    Returns:
+        List[ET.Element]: ``[blueprint_tree]`` in xdl files, XML trees of
+        blueprint steps in xdlexe files.
+    """
+    if not full_tree:
+        props = blueprint.properties
+        default_props = blueprint.DEFAULT_PROPS
+        blueprint_tree = ET.Element(blueprint.name)
+        for prop in blueprint.PROP_TYPES:
+            val = props.get(prop)
+            # Skip unset properties, and defaults unless writing all properties.
+            if val is None or val == "":
+                continue
+            if full_properties or val != default_props.get(prop):
+                blueprint_tree.attrib[prop] = str(val)
+        return [blueprint_tree]
+
+    step_trees = []
+    for substep in blueprint.steps:
+        step_trees.extend(
+            _get_step_tree(
+                substep, full_properties=full_properties, full_tree=full_tree
+            )
+        )
+    return step_trees
+
+
+@functools.lru_cache(maxsize=None)
+def _write_filter_sets(step_class: type) -> tuple[frozenset, frozenset]:
+    """Get ``INTERNAL_PROPS`` and ``ALWAYS_WRITE`` of given step class as
+    frozensets, so that membership tests for every written property are
+    constant time. Cached per class as these are class level specifications.
+
+    Args:
+        step_class (type): Step class to get property sets for.
+
+    Returns:
+        Tuple[frozenset, frozenset]: ``(internal_props, always_write)``
+    """
+    return frozenset(step_class.INTERNAL_PROPS), frozenset(step_class.ALWAYS_WRITE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _std_units_str(val: str) -> Any:
+    """Cached ``convert_val_to_std_units`` for string values.
+
+    Args:
+        val (str): Value with units, e.g. ``'30 mins'``.
+
+    Returns:
+        Any: Value in standard units.
+    """
+    return convert_val_to_std_units(val)
+
+
+def _default_in_std_units(default: Any) -> Any:
+    """Convert default property value to standard units. String defaults are
+    the same handful of values across every step of a class, so conversions are
+    cached. Other values are returned unchanged by ``convert_val_to_std_units``
+    and may be unhashable, so are not cached.
+
+    Args:
+        default (Any): Default value from ``DEFAULT_PROPS``.
+
+    Returns:
+        Any: Default value in standard units.
+    """
+    if type(default) is str:
+        return _std_units_str(default)
+    return default
 
 
 def _add_step_property(
     step_tree: ET.Element,
-    step: Step,
     prop: str,
+    val: Any,
+    prop_type: type,
+    prop_limits: Dict[str, PropLimit],
+    default_props: Dict[str, Any],
+    internal_props: frozenset,
+    always_write: frozenset,
     full_properties: bool = False,
     full_tree: bool = False,
 ) -> None:
-    """Add given property to step tree of given step.
+    """Add given property to step tree of given step. The step's property
+    specification is passed in already looked up by the caller, as this is
+    called for every property of every step.
 
     Args:
         step_tree (ET.Element): Step tree to add property to.
-        step (Step): Step corresponding to ``step_tree``.
         prop (str): Property to add to ``step_tree``.
+        val (Any): Value of ``prop`` in the step's properties.
+        prop_type (type): Type of ``prop`` from the step's ``PROP_TYPES``.
+        prop_limits (Dict[str, PropLimit]): Step's ``PROP_LIMITS``.
+        default_props (Dict[str, Any]): Step's ``DEFAULT_PROPS``.
+        internal_props (frozenset): Step's ``INTERNAL_PROPS``.
+        always_write (frozenset): Step's ``ALWAYS_WRITE``.
         full_properties (bool): If ``True``, all properties will be written.
             If ``False`` only mandatory, non default values and always write
             properties will be written.
         full_tree (bool): If ``True``, full step tree will be written as is the
             case in xdlexe files. This applies to ``'children'`` property.
     """
-    val = step.properties[prop]
-
     if prop == "children" and val:
-        if full_properties:
-            children_tree = ET.Element("Children")
-
-            # need to instantiate children 'Step' objects before writing them
-            # val = steps_from_step_templates(step, val, bindings={}, validate=False)
-
-            for child in val:
-                child_tree = _get_step_tree(
-                    child, full_properties=full_properties, full_tree=full_tree
-                )
-                children_tree.extend([*child_tree])
-            step_tree.extend([*children_tree])
-        else:
-            for child in val:
-                child_tree = _get_step_tree(
-                    child, full_properties=full_properties, full_tree=full_tree
-                )
-                step_tree.extend([*child_tree])
+        # need to instantiate children 'Step' objects before writing them
+        # val = steps_from_step_templates(step, val, bindings={}, validate=False)
+
+        # Child trees are written directly inside the step tree, with or
+        # without full_properties.
+        for child in val:
+            child_trees = _get_step_tree(
+                child, full_properties=full_properties, full_tree=full_tree
+            )
+            step_tree.extend(child_trees)
     else:
         if val is not None or full_properties:
             # if self.full_properties is False ignore some properties.
@@ -313,26 +539,34 @@ def _add_step_property(
                 # Don't write properties that are the same as the
                 # default.
                 if (
-                    prop in step.DEFAULT_PROPS
-                    and convert_val_to_std_units(step.DEFAULT_PROPS[prop]) == val
+                    prop in default_props
+                    and _default_in_std_units(default_props[prop]) == val
                 ):
 
                     # Some things should always be written even if they
                     # are default.
-                    if prop not in step.ALWAYS_WRITE:
+                    if prop not in always_write:
                         return
 
                 # Don't write internal properties.
-                if prop in step.INTERNAL_PROPS:
+                if prop in internal_props:
                     return
-            # Convert value to nice units and add to element attrib.
-            formatted_property = format_property(
-                prop,
-                val,
-                step.PROP_TYPES[prop],
-                step.PROP_LIMITS.get(prop, None),
-                human_readable=False,
-            )
+            # Convert value to nice units and add to element attrib. Quantity
+            # props go straight to their unit formatter, except
+            # remove_dead_volume which format_property writes as is unless it
+            # has a time limit.
+            prop_limit = prop_limits.get(prop, None)
+            formatter = _LIMIT_FORMATTERS.get(prop_limit)
+            if (
+                val is not None
+                and formatter is not None
+                and (prop != "remove_dead_volume" or prop_limit is TIME_PROP_LIMIT)
+            ):
+                formatted_property = formatter(val)
+            else:
+                formatted_property = format_property(
+                    prop, val, prop_type, prop_limit, human_readable=False
+                )
 
             if formatted_property is None:
                 formatted_property = str(formatted_property)
@@ -345,6 +579,21 @@ def _add_step_property(
 ###############################
 
 
+@functools.lru_cache(maxsize=4096)
+def _xml_attr_escape(val: str) -> str:
+    """Escape string for use as a double quoted XML attribute value. Cached as
+    the same reagent names, component types and default values recur many
+    times in a procedure.
+
+    Args:
+        val (str): Attribute value to escape.
+
+    Returns:
+        str: Escaped attribute value.
+    """
+    return escape(val, {'"': "&quot;"})
+
+
 def _get_element_xdl_string(
     element: ET.ElementTree, indent_level=0, indent="  "
 ) -> str:
@@ -362,30 +611,54 @@ def _get_element_xdl_string(
     Returns:
         str: Pretty printed XML string of given XML tree.
     """
-    s = ""
-    s += f"{indent * indent_level}<{element.tag}\n"
-    has_children = list(element.findall("*"))
-    indent_level += 1
-    # Element Properties
-    for attr, val in element.attrib.items():
-        if val is not None:
-            if attr == "context":
-                continue
-            s += f'{indent * indent_level}{attr}="{val}"\n'
+    out = io.StringIO()
+    _write_element_xdl(element, out, indent_level=indent_level, indent=indent)
+    return out.getvalue()
 
-    if has_children:
-        s = s[:-1] + ">\n"
-    else:
-        s = s[:-1] + " />\n"
-    for subelement in element.findall("*"):
-        s += _get_element_xdl_string(
-            subelement, indent_level=indent_level, indent=indent
-        )
 
-    indent_level -= 1
-    if has_children:
-        s += f"{indent * indent_level}</{element.tag}>\n"
-    return s
+def _write_element_xdl(
+    element: ET.ElementTree, out: TextIO, indent_level=0, indent="  "
+) -> None:
+    """Write given Step, Reagent or Component XML tree as pretty printed XML to
+    ``out``.
+
+    Args:
+        element (ET.ElementTree): Step, Reagent or Component XML tree to
+            write.
+        out (TextIO): Object with a ``write`` method to write XML to, e.g.
+            ``io.StringIO`` or open text file.
+        indent_level (int): Defaults to 0. Indent level of ``element``.
+        indent (str): Defaults to ``'  '``. Indent to use for pretty printing
+            XML string.
+    """
+    write = out.write
+    # Stack of elements still to write with their indent level, and closing
+    # tags to write once all subelements of an element have been written.
+    stack = [(element, indent_level)]
+    while stack:
+        item = stack.pop()
+        if type(item) is str:
+            write(item)
+            continue
+
+        element, indent_level = item
+        tag_indent = indent * indent_level
+        attr_indent = tag_indent + indent
+        # Element Properties
+        write(f"{tag_indent}<{element.tag}")
+        for attr, val in element.attrib.items():
+            if val is not None and attr != "context":
+                write(f'\n{attr_indent}{attr}="{_xml_attr_escape(str(val))}"')
+
+        if not len(element):
+            write(" />\n")
+            continue
+
+        write(">\n")
+        stack.append(f"{tag_indent}</{element.tag}>\n")
+        stack.extend(
+            (subelement, indent_level + 1) for subelement in reversed(element)
+        )
 
 
 def _get_xdl_string(xdltree: ET.ElementTree) -> str:
@@ -397,42 +670,118 @@ def _get_xdl_string(xdltree: ET.ElementTree) -> str:
     Returns:
         str: XML string
     """
+    out = io.StringIO()
+    _write_xdl(xdltree, out)
+    return out.getvalue()
+
+
+def _write_xdl(
+    xdltree: ET.ElementTree,
+    out: TextIO,
+    write_procedure: Callable[[TextIO], None] = None,
+) -> None:
+    """Write XDL element tree as pretty XML to ``out``.
+
+    Args:
+        xdltree (ET.ElementTree): element tree of XDL
+        out (TextIO): Object with a ``write`` method to write XML to, e.g.
+            ``io.StringIO`` or open text file.
+        write_procedure (Callable[[TextIO], None]): Optional function to write
+            Procedure section to ``out`` after the sections in ``xdltree``.
+    """
     indent = "  "
     # Synthesis tag
-    s = f'<?xdl version="{XDL_VERSION}" ?>\n'
-    s += "<XDL>\n\n"
-    s += "<Synthesis"
+    out.write(f'<?xdl version="{XDL_VERSION}" ?>\n<XDL>\n\n<Synthesis')
     if xdltree.attrib:
-        s += "\n"
-        for prop in xdltree.attrib:
-            s += f'{indent}{prop}="{xdltree.attrib[prop]}"\n'
-    s += ">\n\n"
-    indent_level = 1
+        out.write("\n")
+        for prop, val in xdltree.attrib.items():
+            out.write(f'{indent}{prop}="{_xml_attr_escape(str(val))}"\n')
+    out.write(">\n\n")
+
     # Hardware, Reagents and Procedure tags
-    for element in xdltree.findall("*"):
+    for element in xdltree:
 
         # Metadata section
         if element.tag == "Metadata":
-            s += _get_element_xdl_string(
-                element, indent=indent, indent_level=indent_level
-            )
-            s += "\n"
+            _write_element_xdl(element, out, indent=indent, indent_level=1)
+            out.write("\n")
 
         # Procedure, Reagents or Hardware section start
         else:
-            s += f"{indent * indent_level}<{element.tag}>\n"
+            out.write(f"{indent}<{element.tag}>\n")
 
-        indent_level += 1
         # Component, Reagent and Step tags
-        for element2 in element.findall("*"):
-            s += _get_element_xdl_string(
-                element2, indent=indent, indent_level=indent_level
-            )
-        indent_level -= 1
+        for element2 in element:
+            _write_element_xdl(element2, out, indent=indent, indent_level=2)
 
         # Procedure, Reagents or Hardware section end
         if element.tag != "Metadata":
-            s += f"{indent * indent_level}</{element.tag}>\n\n"
-    s += "</Synthesis>\n\n"
-    s += "</XDL>\n"
-    return s
+            out.write(f"{indent}</{element.tag}>\n\n")
+
+    if write_procedure is not None:
+        write_procedure(out)
+    out.write("</Synthesis>\n\n</XDL>\n")
+
+
+def _write_procedure(
+    xdl_obj: XDL,
+    out: TextIO,
+    full_properties: bool = False,
+    full_tree: bool = False,
+) -> None:
+    """Write Procedure section of XDL object to ``out``, generating and writing
+    the tree of each step in turn. Steps not in a section are written first,
+    followed by each procedure section, as in :func:`_append_procedure_tree`.
+
+    Args:
+        xdl_obj (XDL): XDL object to write procedure of.
+        out (TextIO): Object with a ``write`` method to write XML to.
+        full_properties (bool): If ``True``, all properties will be written.
+            If ``False`` only mandatory, non default values and always write
+            properties will be written.
+        full_tree (bool): If ``True``, full step tree will be written as is the
+            case in xdlexe files.
+    """
+    indent = "  "
+    out.write(f"{indent}<Procedure>\n")
+
+    # XDLEXE, don't worry about procedure sections.
+    if full_tree:
+        section_steps, uuid_to_section = {}, {}
+    else:
+        section_steps, uuid_to_section = _get_procedure_sections(xdl_obj)
+
+    for step in xdl_obj.steps:
+        section = uuid_to_section.get(step.uuid)
+        if section is None:
+            # step is no_section
+            for step_tree in _get_step_tree(
+                step, full_properties=full_properties, full_tree=full_tree
+            ):
+                _write_element_xdl(step_tree, out, indent=indent, indent_level=2)
+        else:
+            if section_steps[section] is None:
+                section_steps[section] = []
+            section_steps[section].append(step)
+
+    for section, steps in section_steps.items():
+        if steps is None:
+            continue
+
+        # Open section tag once first step tree is written, so sections with
+        # no step trees are written as empty elements.
+        opened = False
+        for step in steps:
+            for step_tree in _get_step_tree(
+                step, full_properties=full_properties, full_tree=full_tree
+            ):
+                if not opened:
+                    out.write(f"{indent * 2}<{section}>\n")
+                    opened = True
+                _write_element_xdl(step_tree, out, indent=indent, indent_level=3)
+        if opened:
+            out.write(f"{indent * 2}</{section}>\n")
+        else:
+            out.write(f"{indent * 2}<{section} />\n")
+
+    out.write(f"{indent}</Procedure>\n\n")
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import sys
 import xml.etree.ElementTree as ET  # noqa: DUO107,N817 # nosec B405
+from collections import OrderedDict
 from typing import Any
 
 from xdl_master.xdl.blueprints import Blueprint, create_blueprint
@@ -21,40 +23,73 @@ from xdl_master.xdl.variables import Variable
 if False:
     from xdl.platforms import AbstractPlatform
 
+#: Attribute names and step tags recur throughout an XDL, so they are interned
+#: to share one string object and let dict lookups match by identity.
+_intern = sys.intern
 
-def apply_step_record(step: Step, step_record_step: tuple[str, dict]):
-    if step.name != step_record_step[0]:
-        raise AssertionError  # TODO: raise more specific exception
-    for prop in step.properties:
+#: Names of attributes read from ``<Synthesis>`` tag.
+_SYNTHESIS_ATTR_NAMES = tuple(attr["name"] for attr in SYNTHESIS_ATTRS)
 
-        # Comments or context don't need to be applied to step record.
-        # No point adding comment or context to substep in xdlexe.
-        if prop in ["comment", "context"]:
-            continue
+#: ``STEP_SECTIONS`` as a set for membership tests on procedure children.
+_STEP_SECTIONS_SET = frozenset(STEP_SECTIONS)
+
+#: Step properties not applied from xdlexe step records.
+_STEP_RECORD_SKIP_PROPS = frozenset({"comment", "context", "children", "uuid"})
+
+#: Sentinel for step record properties that are missing, as ``None`` is valid.
+_MISSING = object()
+
+#: Maximum number of parsed XDL files kept in :data:`_XDL_TREE_CACHE`.
+_XDL_TREE_CACHE_SIZE = 32
 
-        if prop != "children" and prop != "uuid":
-            if prop not in step_record_step[1]:
+#: Parsed XDL files searched by :func:`retrieve_blueprint`, keyed by path, with
+#: the ``(st_mtime_ns, st_size)`` of the file when it was parsed. Least
+#: recently used first, at most :data:`_XDL_TREE_CACHE_SIZE` entries.
+_XDL_TREE_CACHE: OrderedDict[str, tuple[tuple[int, int], ET.ElementTree]] = (
+    OrderedDict()
+)
+
+
+def apply_step_record(step: Step, step_record_step: tuple[str, dict]):
+    # Walk step and its substeps with an explicit stack, pushing substeps after
+    # the parent step is updated as update() may regenerate them.
+    stack = [(step, step_record_step)]
+    while stack:
+        step, step_record_step = stack.pop()
+        if step.name != step_record_step[0]:
+            raise AssertionError  # TODO: raise more specific exception
+
+        props = step.properties
+        record_props = step_record_step[1]
+        for prop in props:
+
+            # Comments or context don't need to be applied to step record.
+            # No point adding comment or context to substep in xdlexe.
+            if prop in _STEP_RECORD_SKIP_PROPS:
+                continue
+
+            val = record_props.get(prop, _MISSING)
+            if val is _MISSING:
                 raise XDLError(
                     f"Property {prop} missing from\
 Step {step_record_step[0]}\nThis file was most likely generated from an\
 older version of XDL. Regenerate the XDLEXE file using the latest\
 version of XDL."
                 )
-            step.properties[prop] = step_record_step[1][prop]
-    step.update()
+            props[prop] = val
+        step.update()
 
-    if isinstance(step, Repeat):
-        return
+        if isinstance(step, (Repeat, AbstractBaseStep)):
+            continue
 
-    if not isinstance(step, AbstractBaseStep):
         if not len(step.steps) == len(step_record_step[2]):
             raise AssertionError(
                 f"{step.steps}\n\n"
                 f"{step_record_step[2]} {len(step.steps)}"
                 f" {len(step_record_step[2])}"
             )
-        for j, substep in enumerate(step.steps):
-            apply_step_record(substep, step_record_step[2][j])
+        # Reversed so substeps are applied in order.
+        stack.extend(reversed(list(zip(step.steps, step_record_step[2]))))
 
 
 def synthesis_attrs_from_xdl(xdl_tree: ET.ElementTree) -> dict[str, Any]:
@@ -66,14 +101,13 @@ def synthesis_attrs_from_xdl(xdl_tree: ET.ElementTree) -> dict[str, Any]:
     Returns:
         Dict[str, Any]: Attr dict from ``<Synthesis>`` tag.
     """
-    raw_attr = {}
-    for element in xdl_tree.iter():
-        raw_attr.update(element.attrib)
-    processed_attr = {}
-    for attr in SYNTHESIS_ATTRS:
-        if attr["name"] in raw_attr:
-            processed_attr[attr["name"]] = raw_attr[attr["name"]]
-    return processed_attr
+    # <Synthesis> is the root in XDL1 and a child of <XDL> in XDL2.
+    root = xdl_tree.getroot() if isinstance(xdl_tree, ET.ElementTree) else xdl_tree
+    synthesis = root if root.tag == "Synthesis" else root.find(".//Synthesis")
+    if synthesis is None:
+        return {}
+    raw_attr = synthesis.attrib
+    return {name: raw_attr[name] for name in _SYNTHESIS_ATTR_NAMES if name in raw_attr}
 
 
 def metadata_from_xdl(xdl_tree: ET.ElementTree) -> Metadata:
@@ -85,12 +119,12 @@ def metadata_from_xdl(xdl_tree: ET.ElementTree) -> Metadata:
     Returns:
         Hardware: Metadata object with any parameters included in XDL loaded
     """
-    for element in xdl_tree.findall("*"):
-        if element.tag == "Metadata":
-            return Metadata(**element.attrib)
-    for element in xdl_tree.find("*"):
-        if element.tag == "Metadata":
-            return Metadata(**element.attrib)
+    # <Metadata> is a child of the root in XDL1, and of <Synthesis> in XDL2.
+    element = xdl_tree.find("Metadata")
+    if element is None:
+        element = xdl_tree.find("*/Metadata")
+    if element is not None:
+        return Metadata(**element.attrib)
     return Metadata()
 
 
@@ -116,7 +150,7 @@ def steps_from_xml(
     """
 
     if not blueprints:
-        blueprints = getattr(context, "blueprints")  # noqa: B009
+        blueprints = context.blueprints
 
     steps = {
         "no_section": [],
@@ -126,49 +160,81 @@ def steps_from_xml(
         "purification": [],
     }
 
-    for child in procedure.findall("*"):
-        if child.tag in STEP_SECTIONS:
-            steps[child.tag.lower()] = steps_from_xml(
-                child, context, blueprints, parameters
-            )["no_section"]
+    parameters_by_id = _parameters_by_id(parameters)
+    step_library = context.platform.step_library
+    no_section = steps["no_section"]
+
+    for child in procedure:
+        if child.tag in _STEP_SECTIONS_SET:
+            steps[child.tag.lower()] = _section_steps_from_xml(
+                child, context, step_library, blueprints, parameters, parameters_by_id
+            )
         else:
-            steps["no_section"].append(
+            no_section.append(
                 xml_to_step(
                     xdl_step_element=child,
-                    step_type_dict=context.platform.step_library,
+                    step_type_dict=step_library,
                     context=context,
                     blueprints=blueprints,
                     parameters=parameters,
+                    parameters_by_id=parameters_by_id,
                 )
             )
     return steps
 
 
+def _section_steps_from_xml(
+    section: ET.Element,
+    context: Context,
+    step_library: dict[str, type],
+    blueprints: dict[str, Blueprint],
+    parameters: list[Parameter] | None,
+    parameters_by_id: dict[str, Parameter],
+) -> list[Step]:
+    """Get Step objects for the steps in a procedure section element.
+
+    Section tags nested within ``section`` are skipped.
+
+    Arguments:
+        section (ET.Element): Procedure section element, e.g. ``<Prep>``.
+        context (Context): Context of the XDL the section is in.
+        step_library (Dict[str, type]): Dict of step names to step classes.
+        blueprints (Dict[str, Blueprint]): Blueprints of the XDL.
+        parameters (List[Parameter]): Parameters of the XDL.
+        parameters_by_id (Dict[str, Parameter]): ``parameters`` by id.
+
+    Returns:
+        List[Step]: Step objects for the steps in ``section``.
+    """
+    return [
+        xml_to_step(
+            xdl_step_element=child,
+            step_type_dict=step_library,
+            context=context,
+            blueprints=blueprints,
+            parameters=parameters,
+            parameters_by_id=parameters_by_id,
+        )
+        for child in section
+        if child.tag not in _STEP_SECTIONS_SET
+    ]
+
+
 def extract_tags(
     xdl_tree: ET.ElementTree, xpath: str, recursive=False
-) -> tuple[str, dict]:
+) -> list[ET.Element]:
     """Parse XDL XML tree for a given XPath (part of the XML document).
 
     Args:
         xdl_tree (ET.ElementTree): ElementTree constructed from XML string.
         xpath (str): path to extract.
-        recursive (bool, optional): If true, will look for 'children'
-            within element and save them as an element attribute.
-            Defaults to False.
+        recursive (bool, optional): Kept for compatibility. Returned elements
+            already contain their children. Defaults to False.
 
     Returns:
-        Tuple[str, Dict]: [description]
+        List[ET.Element]: Elements matching ``xpath``.
     """
-    result = []
-    for element in xdl_tree.findall(xpath):
-        attrib = dict(element.attrib)
-        if recursive:
-            children = extract_tags(element, "*", recursive=True)
-            if children:
-                attrib["children"] = children
-        # result.append((element.tag, attrib))
-        result.append(element)
-    return result
+    return xdl_tree.findall(xpath)
 
 
 def blueprints_from_xdl(
@@ -195,14 +261,8 @@ def get_base_steps(step: ET.Element) -> list[AbstractBaseStep]:
     Args:
         step (ET.Element): Step XML tree to get base steps from.
     """
-    base_steps = []
-    children = step.findall("*")
-    if children:
-        for child in children:
-            base_steps.extend(get_base_steps(child))
-    else:
-        return [step]
-    return base_steps
+    # Leaf elements in document order, same as a depth first recursion.
+    return [element for element in step.iter() if not len(element)]
 
 
 def find_element(
@@ -268,7 +328,7 @@ def xml_to_step_template(
             step_type_dict=step_type_dict,
             context=context,
         )
-        for child in element.findall("*")
+        for child in element
     ]
 
     if children:
@@ -308,33 +368,30 @@ def xml_to_blueprint(
         "base_scale": None,
     }
 
-    for child in xml_blueprint_element.findall("*"):
-        if child.tag == "Hardware":
-            for grandchild in child.findall("*"):
-                blueprint_dict[child.tag.lower()].append(xml_to_component(grandchild))
-        if child.tag == "Parameters":
-            for grandchild in child.findall("*"):
-                blueprint_dict[child.tag.lower()].append(xml_to_parameter(grandchild))
-        elif child.tag == "Reagents":
-            for grandchild in child.findall("*"):
-                blueprint_dict[child.tag.lower()].append(xml_to_reagent(grandchild))
+    steps = blueprint_dict["steps"]
+    no_section = steps["no_section"]
+
+    for child in xml_blueprint_element:
+        section_parser = _BLUEPRINT_SECTION_PARSERS.get(child.tag)
+        if section_parser is not None:
+            key, xml_to_obj = section_parser
+            blueprint_dict[key].extend(xml_to_obj(grandchild) for grandchild in child)
+
         elif child.tag == "Procedure":
             if "base_scale" in child.attrib:
                 blueprint_dict["base_scale"] = child.attrib["base_scale"]
-            for grandchild in child.findall("*"):
-                if grandchild.tag in STEP_SECTIONS:
-                    step_section = blueprint_dict["steps"][grandchild.tag]
-                    for great_grandchild in grandchild.findall("*"):
-                        step_section.append(
-                            xml_to_step_template(
-                                element=great_grandchild,
-                                step_type_dict=step_type_dict,
-                                context=context,
-                            )
+            for grandchild in child:
+                if grandchild.tag in _STEP_SECTIONS_SET:
+                    steps[grandchild.tag].extend(
+                        xml_to_step_template(
+                            element=great_grandchild,
+                            step_type_dict=step_type_dict,
+                            context=context,
                         )
+                        for great_grandchild in grandchild
+                    )
                 else:
-                    step_section = blueprint_dict["steps"]["no_section"]
-                    step_section.append(
+                    no_section.append(
                         xml_to_step_template(
                             element=grandchild,
                             step_type_dict=step_type_dict,
@@ -350,6 +407,7 @@ def xml_to_step(
     context: Context,
     blueprints: list[Blueprint] | None = None,
     parameters: list[Parameter] | None = None,
+    parameters_by_id: dict[str, Parameter] | None = None,
 ) -> Step:
     """Given XDL step element return corresponding Step object.
 
@@ -365,6 +423,9 @@ def xml_to_step(
             xdl file. Defaults to None.
         parameters (List[Parameter]): list of parameters associated with the
             xdl file. Defaults to None.
+        parameters_by_id (Dict[str, Parameter]): ``parameters`` by id, as
+            returned by ``_parameters_by_id``. Pass when converting many steps
+            to avoid rebuilding it for every step. Defaults to None.
 
     Returns:
         Step: Step object corresponding to step in ``xdl_step_element``.
@@ -373,22 +434,25 @@ def xml_to_step(
 
     #  valid XML tags corresponding to a step can either be a standard step or
     #  a blueprint (from which standard steps can later be spawned)
-    tag = xdl_step_element.tag
-    valid_tags = {**step_type_dict, **blueprints}
+    tag = _intern(xdl_step_element.tag)
 
-    if not context.invalid_steps:
-        context.update(invalid_steps=[])
+    # ``context.invalid_steps`` may be looked up through parent contexts, so
+    # only fetch it once.
+    invalid_steps = context.invalid_steps
+    if not invalid_steps:
+        invalid_steps = []
+        context.update(invalid_steps=invalid_steps)
 
     # Check if step name is valid and get step class.
-    if tag not in valid_tags:
-        context.invalid_steps.append(tag)
+    if tag not in step_type_dict and tag not in blueprints:
+        invalid_steps.append(tag)
 
     children_steps = []
-    children = xdl_step_element.findall("*")
+    children = list(xdl_step_element)
     children_steps.extend(children)
 
     # Check all attributes are valid.
-    attrs = dict(xdl_step_element.attrib)
+    attrs = _interned_attrib(xdl_step_element)
 
     # treat invalid as blueprint steps and try to resolve them
     if (tag in blueprints) or (tag not in step_type_dict):
@@ -396,29 +460,29 @@ def xml_to_step(
         if tag not in blueprints:
             resolved_bps = [
                 retrieve_blueprint(name=s, context=context)
-                for s in context.invalid_steps
+                for s in invalid_steps
             ]
             blueprints.update({b.id: b for b in resolved_bps})
         step_type = blueprints[tag]
     else:
         step_type = step_type_dict[tag]
 
-    final_attrs = {}
-    parameter_ids = [p.id for p in parameters]
-
-    for attr in attrs:
-        final_attrs[attr] = attrs[attr]
+    if parameters_by_id is None:
+        parameters_by_id = _parameters_by_id(parameters)
 
-        if attrs[attr].lower() == "none":
-            final_attrs[attr] = None
+    final_attrs = {}
+    for attr, value in attrs.items():
+        final_attrs[attr] = None if value.lower() == "none" else value
 
         # resolve any parameter values
-        if attr.startswith("param.") or attrs[attr] in parameter_ids:
-            value = attrs[attr]
-            if attr.startswith("param."):
-                attr = attr.split(".")[-1]
+        is_param_attr = attr[:6] == "param."
+        if is_param_attr or value in parameters_by_id:
+            if is_param_attr:
+                attr = _intern(attr.split(".")[-1])
 
-            final_attrs[attr] = map_xdl_to_parameter(value=value, parameters=parameters)
+            final_attrs[attr] = map_xdl_to_parameter(
+                value=value, parameters=parameters_by_id
+            )
 
     # resolve child steps
     children_steps = [
@@ -459,7 +523,7 @@ def xml_to_component(xdl_component_element: ET.Element) -> Component:
         Component: Component object corresponding to component in
         ``xdl_component_element``.
     """
-    attrs = dict(xdl_component_element.attrib)
+    attrs = _interned_attrib(xdl_component_element)
 
     # Check 'id' is in attrs..
     if "id" not in attrs:
@@ -491,7 +555,7 @@ def xml_to_parameter(xdl_parameter_element: ET.Element) -> Parameter:
         Parameter: Parameter object corresponding to parameter in
         ``xdl_parameter_element``.
     """
-    attrs = dict(xdl_parameter_element.attrib)
+    attrs = _interned_attrib(xdl_parameter_element)
     # Check 'id' is in attrs..
     if "id" not in attrs:
         raise XDLError("'id' attribute not specified for parameter.")
@@ -540,38 +604,74 @@ def xml_to_reagent(xdl_reagent_element: ET.Element) -> Reagent:
         ``xdl_reagent_element``.
     """
     # Check attrs are valid for Reagent
-    attrs = dict(xdl_reagent_element.attrib)
+    attrs = _interned_attrib(xdl_reagent_element)
     # Try to instantiate Reagent object and return it.
     reagent = Reagent(**attrs)
 
     return reagent
 
 
-def map_xdl_to_parameter(value: str, parameters: list[Parameter]) -> Any:
+def _interned_attrib(element: ET.Element) -> dict[str, str]:
+    """Copy element attributes into a new dict with interned keys.
+
+    Args:
+        element (ET.Element): Element to get attributes from.
+
+    Returns:
+        Dict[str, str]: Attributes of ``element``.
+    """
+    return {_intern(k): v for k, v in element.attrib.items()}
+
+
+def _parameters_by_id(parameters: list[Parameter] | None) -> dict[str, Parameter]:
+    """Get dict of parameters by id for mapping XDL values to parameters.
+
+    Args:
+        parameters (List[Parameter]): List of Parameter objects.
+
+    Returns:
+        Dict[str, Parameter]: Parameters by id.
+
+    Raises:
+        XDLDuplicateParameterID: More than one parameter has the same id.
+    """
+    parameters_by_id = {}
+    for parameter in parameters or []:
+        if parameter.id in parameters_by_id:
+            raise XDLDuplicateParameterID(
+                parameter=parameter.id,
+                matches=[p for p in parameters if p.id == parameter.id],
+            )
+        parameters_by_id[parameter.id] = parameter
+    return parameters_by_id
+
+
+#: Blueprint sections parsed into lists of objects, with the ``blueprint_dict``
+#: key and function used to parse each element in the section.
+_BLUEPRINT_SECTION_PARSERS = {
+    "Hardware": ("hardware", xml_to_component),
+    "Parameters": ("parameters", xml_to_parameter),
+    "Reagents": ("reagents", xml_to_reagent),
+}
+
+
+def map_xdl_to_parameter(value: str, parameters: dict[str, Parameter]) -> Any:
     """Map a non-blueprint (global) parameter to a Parameter value.
 
     Args:
         value (str): string to be mapped to a Parameter (must match a parameter
         id to be matched).
-        parameters (List[Parameter]): List of Parameter objects to map to.
+        parameters (Dict[str, Parameter]): Parameter objects to map to by id,
+            as returned by ``_parameters_by_id``.
 
     Returns:
         parameter.value (Any): final mapped parameter value
     """
+    parameter = parameters.get(value) if parameters else None
 
-    if not parameters:
+    if parameter is None:
         return None
 
-    parameter_match = [p for p in parameters if p.id == value]
-
-    if not parameter_match:
-        return None
-
-    if len(parameter_match) > 1:
-        XDLDuplicateParameterID(parameter=value, matches=parameter_match)
-
-    parameter = parameter_match[0]
-
     return parameter.value
 
 
@@ -595,17 +695,27 @@ def retrieve_blueprint(name: str, context: Context, folder: str = None):
     if folder is None:
         folder = context.working_directory
 
-    xdl_files = [
-        os.path.join(folder, f) for f in os.listdir(folder) if f.endswith(".xdl")
-    ]
+    with os.scandir(folder) as entries:
+        xdl_files = [
+            (entry.path, entry.stat())
+            for entry in entries
+            if entry.name.endswith(".xdl")
+        ]
 
     all_blueprints = []
 
     if xdl_files:
 
-        for xdl_file in xdl_files:
+        for xdl_file, xdl_file_stat in xdl_files:
+
+            xdl_tree = _parse_xdl_file(xdl_file, xdl_file_stat)
+
+            # Only build blueprints of files declaring the one wanted.
+            if not any(
+                element.get("id") == name for element in xdl_tree.iter("Blueprint")
+            ):
+                continue
 
-            xdl_tree = ET.ElementTree(ET.fromstring(read_file(xdl_file)))  # nosec B314
             file_bps = blueprints_from_xdl(
                 xdl_tree=xdl_tree,
                 step_type_dict=context.platform.step_library,
@@ -644,6 +754,38 @@ def retrieve_blueprint(name: str, context: Context, folder: str = None):
     return matching_bps[0]
 
 
+def _parse_xdl_file(xdl_file: str, xdl_file_stat: os.stat_result) -> ET.ElementTree:
+    """Parse XDL file, reusing the tree from a previous parse if the file has
+    not changed since. Blueprint resolution searches the same folder for every
+    unresolved step, so files would otherwise be parsed many times. Only the
+    :data:`_XDL_TREE_CACHE_SIZE` most recently used trees are kept.
+
+    Args:
+        xdl_file (str): Path to XDL file.
+        xdl_file_stat (os.stat_result): Stat of ``xdl_file``.
+
+    Returns:
+        ET.ElementTree: Parsed XDL file.
+    """
+    key = (xdl_file_stat.st_mtime_ns, xdl_file_stat.st_size)
+    cached = _XDL_TREE_CACHE.get(xdl_file)
+    if cached is not None and cached[0] == key:
+        _XDL_TREE_CACHE.move_to_end(xdl_file)
+        return cached[1]
+
+    try:
+        xdl_tree = ET.parse(xdl_file)  # nosec B314
+    except ET.ParseError:
+        # Not valid in its declared encoding (UTF-8 if none given), read_file
+        # falls back to ISO-8859-1.
+        xdl_tree = ET.ElementTree(ET.fromstring(read_file(xdl_file)))  # nosec B314
+    _XDL_TREE_CACHE[xdl_file] = (key, xdl_tree)
+    _XDL_TREE_CACHE.move_to_end(xdl_file)
+    if len(_XDL_TREE_CACHE) > _XDL_TREE_CACHE_SIZE:
+        _XDL_TREE_CACHE.popitem(last=False)
+    return xdl_tree
+
+
 ##########################
 # .xdlexe interpretation #
 ##########################
@@ -664,7 +806,7 @@ def get_full_step_record(procedure_tree: ET.Element) -> list[tuple]:
         ``[(step_name, step_properties, substeps)...]``
     """
     step_record = []
-    for step in procedure_tree.findall("*"):
+    for step in procedure_tree:
         step_record.append(get_single_step_record(step))
     return step_record
 
@@ -679,7 +821,15 @@ def get_single_step_record(step_element: ET.Element) -> tuple[str, dict, list]:
         Tuple[str, Dict, List]: Step record in the form
         ``(step_name, step_properties, substeps)``
     """
-    children = []
-    for step in step_element.findall("*"):
-        children.append(get_single_step_record(step))
-    return (step_element.tag, step_element.attrib, children)
+    step_record = (step_element.tag, step_element.attrib, [])
+
+    # Walk substeps with an explicit stack, each element paired with the list
+    # its substep records are appended to.
+    stack = [(step_element, step_record[2])]
+    while stack:
+        element, substeps = stack.pop()
+        for step in element:
+            substep_record = (step.tag, step.attrib, [])
+            substeps.append(substep_record)
+            stack.append((step, substep_record[2]))
+    return step_record
@@ -8,31 +8,14 @@ from typing import Any, Dict, List, Tuple
 # Other
 from networkx import MultiDiGraph
 
-from xdl_master.xdl.steps.core.abstract_base_step import AbstractBaseStep
+from xdl_master.xdl.steps.core.abstract_base_step import (
+    AbstractBaseStep,
+    get_base_steps,
+)
 from xdl_master.xdl.steps.core.step import Step
 from xdl_master.xdl.steps.utils import FTNDuration
 
 
-def get_base_steps(step: Step) -> List[AbstractBaseStep]:
-    """Return list of given step's base steps. Recursively descends step tree
-    to find base steps. Here rather than in utils as uses ``AbstractBaseStep``
-    type so would cause circular import.
-
-    Args:
-        step (Step): Step to get base steps from.
-
-    Returns:
-        List[AbstractBaseStep]: List of step's base steps.
-    """
-    base_steps = []
-    for step in step.steps:  # noqa: B020
-        if isinstance(step, AbstractBaseStep):
-            base_steps.append(step)
-        else:
-            base_steps.extend(get_base_steps(step))
-    return base_steps
-
-
 class AbstractAsyncStep(Step):
     """For executing code asynchronously. Can only be used programmatically,
     no way of encoding this in XDL files.
@@ -46,6 +29,7 @@ class AbstractAsyncStep(Step):
             with.
     """
 
+    _is_non_recursive: bool = True
     _context = None
 
     def __init__(self, param_dict: Dict[str, Any]) -> None:
@@ -93,11 +77,11 @@ class AbstractAsyncStep(Step):
 
         task = self.async_execute(platform_controller, logger, level, step_indexes)
 
-        loop = asyncio.new_event_loop()
-
-        self.thread = threading.Thread(
-            target=loop.run_until_complete, args=(task,), daemon=True
-        )
+        # Each async step gets its own thread and event loop, as platform
+        # controller calls block and would otherwise hold up other async steps.
+        # ``asyncio.run`` closes the loop when the task finishes so loops and
+        # their file descriptors don't accumulate over a procedure.
+        self.thread = threading.Thread(target=asyncio.run, args=(task,), daemon=True)
         self.thread.start()
 
         return True
@@ -109,13 +93,7 @@ class AbstractAsyncStep(Step):
         Returns:
             List[AbstractBaseStep]: Step's base steps.
         """
-        base_steps = []
-        for step in self.steps:
-            if isinstance(step, AbstractBaseStep):
-                base_steps.append(step)
-            else:
-                base_steps.extend(get_base_steps(step))
-        return base_steps
+        return get_base_steps(self)
 
     def _update_substep_context(self):
         """Update substeps contexts making substeps parent_context point
@@ -178,10 +156,7 @@ class AbstractAsyncStep(Step):
         for substep in self.steps:
             step_reagents_consumed = substep.reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
-                if reagent in reagents_consumed:
-                    reagents_consumed[reagent] += volume
-                else:
-                    reagents_consumed[reagent] = volume
+                reagents_consumed[reagent] = reagents_consumed.get(reagent, 0) + volume
         return reagents_consumed
 
     def duration(self, graph: MultiDiGraph) -> FTNDuration:
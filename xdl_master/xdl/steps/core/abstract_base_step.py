@@ -1,5 +1,6 @@
 # Std
 import asyncio
+import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Tuple, Union
 
@@ -23,6 +24,8 @@ class AbstractBaseStep(Step, ABC):
             with.
     """
 
+    _is_non_recursive: bool = True
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         super().__init__(param_dict)
         self.steps = []
@@ -89,37 +92,77 @@ class AbstractBaseStep(Step, ABC):
             if lock not in parent_locks
         }
 
+        # Nothing to wait for or acquire, so skip entering
+        # ``await_requirements`` and execute the step straight away.
+        if not deps and not locks:
+            try:
+                return await self._execute_and_log(
+                    platform_controller, tracer, step_indexes, level
+                )
+            except Exception:
+                self._log_step_failure()
+                raise
+
         async with super().await_requirements(deps, locks) as keep_going:
             if not keep_going:
                 return keep_going
 
-            # Log base step start timestamp here, as it is easier than
-            # adding to all base step `execute` methods. Only base step
-            # logged here as normal step start / end timestamps logged
-            # at start / end of this method.
-            log_duration(self, "start")
+            return await self._execute_and_log(
+                platform_controller, tracer, step_indexes, level
+            )
 
-            # Log step start
+    async def _execute_and_log(
+        self,
+        platform_controller: Any,
+        tracer: List[Tuple[type, Dict]],
+        step_indexes: List[int],
+        level: int,
+    ) -> bool:
+        """Execute step once its requirements are met, logging its start and
+        end and updating the tracer.
+
+        Args:
+            platform_controller (Any): Platform controller object instantiated
+                with modules and graph to run XDL on.
+            tracer ([List]): List of previously executed Steps and their
+                properties at the point of execution.
+            step_indexes (List[int]): Indexes into steps list and substeps
+                lists.
+            level (int): Level of recursion in step execution.
+
+        Returns:
+            bool: ``True`` if execution should continue, ``False`` if execution
+            should stop.
+        """
+        # Log base step start timestamp here, as it is easier than
+        # adding to all base step `execute` methods. Only base step
+        # logged here as normal step start / end timestamps logged
+        # at start / end of this method.
+        log_duration(self, "start")
+
+        # Log step start, only building the message if it will be logged
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(start_executing_step_msg(self, step_indexes))
 
-            # Execute step, don't pass `step_indexes` to base step,
-            # and log step completion here. Step completion isn't
-            # needed to be logged for normal steps as it is done
-            # recursively at the end of this function.
-            keep_going = await self.execute(
-                platform_controller, logger=self.logger, level=level
-            )
+        # Execute step, don't pass `step_indexes` to base step,
+        # and log step completion here. Step completion isn't
+        # needed to be logged for normal steps as it is done
+        # recursively at the end of this function.
+        keep_going = await self.execute(
+            platform_controller, logger=self.logger, level=level
+        )
 
-            update_tracer(tracer, self)
+        update_tracer(tracer, self)
 
-            # Log base step end timestamp here, as it is easier
-            # than adding to all base step `execute` methods.
-            log_duration(self, "end")
+        # Log base step end timestamp here, as it is easier
+        # than adding to all base step `execute` methods.
+        log_duration(self, "end")
 
-            # Log step completion
+        # Log step completion
+        if self.logger.isEnabledFor(logging.INFO):
             self.logger.info(finished_executing_step_msg(self, step_indexes))
 
-            return keep_going
+        return keep_going
 
     @property
     def base_steps(self):
@@ -127,3 +170,26 @@ class AbstractBaseStep(Step, ABC):
         method of ``AbstractStep``. No need to override this.
         """
         return [self]
+
+
+def get_base_steps(step: Step) -> List[AbstractBaseStep]:
+    """Return list of given step's base steps. Descends step tree in order to
+    find base steps. Here rather than in utils as uses ``AbstractBaseStep``
+    type so would cause circular import.
+
+    Args:
+        step (Step): Step to get base steps from.
+
+    Returns:
+        List[AbstractBaseStep]: List of step's base steps.
+    """
+    base_steps = []
+    # Substeps are pushed in reverse so they are popped in order.
+    stack = list(reversed(step.steps))
+    while stack:
+        substep = stack.pop()
+        if isinstance(substep, AbstractBaseStep):
+            base_steps.append(substep)
+        else:
+            stack.extend(reversed(substep.steps))
+    return base_steps
@@ -8,7 +8,10 @@ from networkx import MultiDiGraph
 
 from xdl_master.xdl.errors import XDLError
 from xdl_master.xdl.steps.core.abstract_async_step import AbstractAsyncStep
-from xdl_master.xdl.steps.core.abstract_base_step import AbstractBaseStep
+from xdl_master.xdl.steps.core.abstract_base_step import (
+    AbstractBaseStep,
+    get_base_steps,
+)
 from xdl_master.xdl.steps.core.step import Step
 from xdl_master.xdl.steps.utils import FTNDuration
 from xdl_master.xdl.utils.logging import get_logger
@@ -17,26 +20,6 @@ if False:
     from xdl.execution import AbstractXDLExecutor
 
 
-def get_base_steps(step: Step) -> List[AbstractBaseStep]:
-    """Return list of given step's base steps. Recursively descends step tree
-    to find base steps. Here rather than in utils as uses ``AbstractBaseStep``
-    type so would cause circular import.
-
-    Args:
-        step (Step): Step to get base steps from.
-
-    Returns:
-        List[AbstractBaseStep]: List of step's base steps.
-    """
-    base_steps = []
-    for step in step.steps:  # noqa: B020
-        if isinstance(step, AbstractBaseStep):
-            base_steps.append(step)
-        else:
-            base_steps.extend(get_base_steps(step))
-    return base_steps
-
-
 class AbstractDynamicStep(Step):
     """Step for containing dynamic experiments in which feedback from analytical
     equipment controls the flow of the experiment.
@@ -55,6 +38,9 @@ class AbstractDynamicStep(Step):
             with.
     """
 
+    _is_non_recursive: bool = True
+    _is_dynamic: bool = True
+
     def __init__(self, param_dict: Dict[str, Any]) -> None:
         super().__init__(param_dict)
         self.state = {}
@@ -73,13 +59,7 @@ class AbstractDynamicStep(Step):
         Returns:
             List[AbstractBaseStep]: Step's base steps.
         """
-        base_steps = []
-        for step in self.steps:
-            if isinstance(step, AbstractBaseStep):
-                base_steps.append(step)
-            else:
-                base_steps.extend(get_base_steps(step))
-        return base_steps
+        return get_base_steps(self)
 
     @abstractmethod
     def on_start(self) -> List[Step]:
@@ -178,18 +158,20 @@ class AbstractDynamicStep(Step):
         step_indexes = step_indexes if step_indexes is not None else [0]
 
         if self.parent:
-            parent_locks = self.parent.tree_locks(platform_controller)
+            parent_locks = frozenset(self.parent.tree_locks(platform_controller))
         else:
-            parent_locks = []
+            parent_locks = frozenset()
+        platform_locks = platform_controller._locks
+
+        # Indexes of each step are the indexes up to this level followed by its
+        # substep index.
+        index_prefix = step_indexes[: level + 1]
 
         for step in block:
-            step_indexes = step_indexes[:]
-            step_indexes.append(0)
-            step_indexes[level + 1] = self.substep_index
-            step_indexes = step_indexes[: level + 2]
+            substep_indexes = index_prefix + [self.substep_index]
 
             step_locks = {
-                lock: platform_controller._locks[lock]
+                lock: platform_locks[lock]
                 for lock in step.locks(platform_controller)
                 if lock not in parent_locks
             }
@@ -200,7 +182,7 @@ class AbstractDynamicStep(Step):
                 deps=None,
                 locks=step_locks,
                 tracer=tracer,
-                step_indexes=step_indexes,
+                step_indexes=substep_indexes,
             )
 
             if isinstance(step, AbstractAsyncStep):
@@ -273,12 +255,14 @@ class AbstractDynamicStep(Step):
             tracer=tracer,
         )
 
-        # Repeatedly execute steps from on_continue until empty list returned
-        continue_block = self.on_continue()
-        self.executor.prepare_block_for_execution(self.graph, continue_block)
+        prepare_block = self.executor.prepare_block_for_execution
+        graph = self.graph
 
-        # Execute steps from on_continue
+        # Repeatedly execute steps from on_continue until empty list returned.
+        # Blocks are only prepared once known to be non empty.
+        continue_block = self.on_continue()
         while continue_block:
+            prepare_block(graph, continue_block)
             await self.execute_block(
                 continue_block,
                 platform_controller=platform_controller,
@@ -286,18 +270,17 @@ class AbstractDynamicStep(Step):
                 tracer=tracer,
             )
             continue_block = self.on_continue()
-            self.executor.prepare_block_for_execution(self.graph, continue_block)
 
         # Execute steps from on_finish
         finish_block = self.on_finish()
-        self.executor.prepare_block_for_execution(self.graph, finish_block)
-
-        await self.execute_block(
-            finish_block,
-            platform_controller=platform_controller,
-            step_indexes=step_indexes,
-            tracer=tracer,
-        )
+        if finish_block:
+            prepare_block(graph, finish_block)
+            await self.execute_block(
+                finish_block,
+                platform_controller=platform_controller,
+                step_indexes=step_indexes,
+                tracer=tracer,
+            )
 
         # Kill all threads
         self._post_finish()
@@ -368,10 +351,7 @@ class AbstractDynamicStep(Step):
         for substep in self.start_block:
             step_reagents_consumed = substep.reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
-                if reagent in reagents_consumed:
-                    reagents_consumed[reagent] += volume
-                else:
-                    reagents_consumed[reagent] = volume
+                reagents_consumed[reagent] = reagents_consumed.get(reagent, 0) + volume
         return reagents_consumed
 
     def duration(self, graph: MultiDiGraph) -> FTNDuration:
@@ -10,32 +10,15 @@ from typing import Any, Dict, Iterator, List, Tuple
 from networkx import MultiDiGraph
 
 from xdl_master.xdl.constants import DONE
-from xdl_master.xdl.steps.core.abstract_base_step import AbstractBaseStep
+from xdl_master.xdl.steps.core.abstract_base_step import (
+    AbstractBaseStep,
+    get_base_steps,
+)
 from xdl_master.xdl.steps.core.step import Step
 from xdl_master.xdl.steps.utils import FTNDuration
 from xdl_master.xdl.utils.logging import get_logger, log_duration
 
 
-def get_base_steps(step: Step) -> List[AbstractBaseStep]:
-    """Return list of given step's base steps. Recursively descends step tree
-    to find base steps. Here rather than in utils as uses ``AbstractBaseStep``
-    type so would cause circular import.
-
-    Args:
-        step (Step): Step to get base steps from.
-
-    Returns:
-        List[AbstractBaseStep]: List of step's base steps.
-    """
-    base_steps = []
-    for step in step.steps:  # noqa: B020
-        if isinstance(step, AbstractBaseStep):
-            base_steps.append(step)
-        else:
-            base_steps.extend(get_base_steps(step))
-    return base_steps
-
-
 class AbstractStep(Step, ABC):
     """Abstract base class for all steps that contain other steps.
     Subclasses must implement steps and human_readable, and can also override
@@ -270,13 +253,7 @@ class AbstractStep(Step, ABC):
         Returns:
             List[AbstractBaseStep]: Step's base steps.
         """
-        base_steps = []
-        for step in self.steps:
-            if isinstance(step, AbstractBaseStep):
-                base_steps.append(step)
-            else:
-                base_steps.extend(get_base_steps(step))
-        return base_steps
+        return get_base_steps(self)
 
     def duration(self, graph: MultiDiGraph) -> FTNDuration:
         """Return approximate duration in seconds of step calculated as sum of
@@ -312,10 +289,7 @@ class AbstractStep(Step, ABC):
         for substep in self.steps:
             step_reagents_consumed = substep.reagents_consumed(graph)
             for reagent, volume in step_reagents_consumed.items():
-                if reagent in reagents_consumed:
-                    reagents_consumed[reagent] += volume
-                else:
-                    reagents_consumed[reagent] = volume
+                reagents_consumed[reagent] = reagents_consumed.get(reagent, 0) + volume
         return reagents_consumed
 
     @property
@@ -4,7 +4,9 @@ import asyncio
 import contextlib
 import copy
 import inspect
+import logging
 import uuid
+import weakref
 from itertools import chain
 from typing import Any
 
@@ -33,6 +35,20 @@ from xdl_master.xdl.utils.misc import SanityCheck, format_property
 from xdl_master.xdl.utils.tracer import update_tracer
 from xdl_master.xdl.utils.vessels import VesselSpec
 
+#: Condition notified whenever a step releases its locks, one per event loop.
+_locks_released: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _locks_released_condition() -> asyncio.Condition:
+    """Get condition notified when step locks are released in the running
+    event loop.
+    """
+    loop = asyncio.get_running_loop()
+    condition = _locks_released.get(loop)
+    if condition is None:
+        condition = _locks_released[loop] = asyncio.Condition()
+    return condition
+
 
 class Step(XDLBase):
     """Base class for all step objects.
@@ -56,6 +72,15 @@ class Step(XDLBase):
     # steps or steps do not conform to cross platform standard.
     localisation: dict[str, str] = LOCALISATIONS
 
+    # Class flags, cheaper to check on hot paths than ``isinstance`` against
+    # ``NON_RECURSIVE_ABSTRACT_STEPS`` / ``AbstractDynamicStep``.
+    _is_non_recursive: bool = False
+    _is_dynamic: bool = False
+
+    # Key of step state after last ``on_prepare_for_execution`` call, used by
+    # executor to skip preparing unchanged steps again.
+    _prep_hash: tuple | None = None
+
     def __init__(
         self,
         param_dict: dict[str, Any],
@@ -228,6 +253,32 @@ class Step(XDLBase):
         """
         return []
 
+    def _sanity_key(self) -> tuple | None:
+        """Return hashable key identifying the outcome of this step's sanity
+        checks: step type plus all properties. Steps with equal keys pass or
+        fail sanity checks identically, so checks only need to be run once per
+        key.
+
+        Only steps without substeps are keyed, as the substeps of other steps
+        can be altered independently of the parent step's properties.
+
+        Returns:
+            tuple | None: Sanity check key, or ``None`` if the step cannot be
+            keyed (step has substeps / children, or unhashable properties).
+        """
+        if (
+            not self._is_non_recursive
+            or self._is_dynamic
+            or "children" in self.properties
+        ):
+            return None
+        key = (type(self), tuple(sorted(self.properties.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
     def final_sanity_check(self, graph: MultiDiGraph) -> None:
         """Run all ``SanityCheck`` objects returned by ``sanity_checks``. Can be
         extended if necessary but ``super().final_sanity_check()`` should always
@@ -500,7 +551,8 @@ class Step(XDLBase):
             # normal step start / end timestamps logged at start / end of this
             # method.
             log_duration(self, "start")
-            self.logger.info(start_executing_step_msg(self, step_indexes))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(start_executing_step_msg(self, step_indexes))
 
             # Execute step, don't pass `step_indexes` to base step, and log step
             # completion here. Step completion isn't needed to be logged for
@@ -519,7 +571,8 @@ class Step(XDLBase):
             # Log base step end timestamp here, as it is easier
             # than adding to all base step `execute` methods.
             log_duration(self, "end")
-            self.logger.info(finished_executing_step_msg(self, step_indexes))
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(finished_executing_step_msg(self, step_indexes))
 
             return keep_going
 
@@ -553,23 +606,32 @@ class Step(XDLBase):
         try:
             yield True
         except Exception as e:
-            step_failed_msg = termcolor.colored(
-                "Step failed", color="red", attrs=["bold"]
-            )
-            step_name = termcolor.colored(self.name, color="cyan", attrs=["bold"])
-            props_table = termcolor.colored(
-                pretty_props_table(self.properties), color="cyan"
-            )
-            self.logger.exception(
-                "%s %s\n%s %s\n",
-                step_failed_msg,
-                step_name,
-                self.human_readable(),
-                props_table,
-            )
+            self._log_step_failure()
             raise e
         finally:
             Step.release_locks(locks)
+            if locks:
+                # Wake steps waiting in acquire_locks to check their locks
+                condition = _locks_released_condition()
+                async with condition:
+                    condition.notify_all()
+
+    def _log_step_failure(self) -> None:
+        """Log exception currently being handled as failure of this step, along
+        with the step's human readable description and properties.
+        """
+        step_failed_msg = termcolor.colored("Step failed", color="red", attrs=["bold"])
+        step_name = termcolor.colored(self.name, color="cyan", attrs=["bold"])
+        props_table = termcolor.colored(
+            pretty_props_table(self.properties), color="cyan"
+        )
+        self.logger.exception(
+            "%s %s\n%s %s\n",
+            step_failed_msg,
+            step_name,
+            self.human_readable(),
+            props_table,
+        )
 
     def __eq__(self, other: Step) -> bool:
         """Allow ``step == other_step`` comparisons."""
@@ -677,15 +739,18 @@ class Step(XDLBase):
             )
             return msg
 
-        while True:
-            unlocked_states = [not lock.locked() for lock in locks.values()]
-            if all(unlocked_states):
-                break
-            await asyncio.sleep(0.5)
-
-        tasks = [lock.acquire() for lock in locks.values()]
-        for task in asyncio.as_completed(tasks):
-            await task
+        lock_objs = list(locks.values())
+        condition = _locks_released_condition()
+        async with condition:
+            # Wait until none of the locks are held, woken each time a step
+            # releases its locks rather than polling. All locks are then
+            # acquired together without yielding to other tasks, so a step
+            # never holds some of its locks while waiting for the others.
+            await condition.wait_for(
+                lambda: not any(lock.locked() for lock in lock_objs)
+            )
+            for lock in lock_objs:
+                await lock.acquire()
 
     @staticmethod
     def release_locks(locks: dict[str | None, asyncio.Lock]) -> None:
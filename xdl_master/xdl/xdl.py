@@ -49,7 +49,10 @@ from xdl_master.xdl.parameters import Parameter
 from xdl_master.xdl.platforms.abstract_platform import AbstractPlatform
 from xdl_master.xdl.readwrite.json import xdl_from_json, xdl_from_json_file, xdl_to_json
 from xdl_master.xdl.readwrite.utils import read_file
-from xdl_master.xdl.readwrite.xml_generator import xdl_to_xml_string
+from xdl_master.xdl.readwrite.xml_generator import (
+    xdl_to_xml_stream,
+    xdl_to_xml_string,
+)
 from xdl_master.xdl.readwrite.xml_interpreter import (
     apply_step_record,
     extract_tags,
@@ -471,7 +474,7 @@ filepath limits of 260, length of current xdl filepath = {len(xdl)}"
         """Obtain graph hash from given xdl string. If xdl string is not xdlexe,
         there will be no graph hash so return ``None``.
         """
-        graph_hash_search = re.search(r'graph_sha256="([a-z0-9]+)"', xdl_str)
+        graph_hash_search = re.search(r'graph_sha256="([a-z0-9:]+)"', xdl_str)
         if graph_hash_search:
             self.graph_sha256 = graph_hash_search[1]
 
@@ -753,14 +756,14 @@ filepath limits of 260, length of current xdl filepath = {len(xdl)}"
                 # Save XDLEXE
                 self.graph_sha256 = self.executor._graph_hash()
                 if save_path and self.write_xexe:
-                    xdlexe = xdl_to_xml_string(
-                        self,
-                        graph_hash=self.graph_sha256,
-                        full_properties=True,
-                        full_tree=True,
-                    )
                     with open(save_path, "w") as fd:
-                        fd.write(xdlexe)
+                        xdl_to_xml_stream(
+                            self,
+                            fd,
+                            graph_hash=self.graph_sha256,
+                            full_properties=True,
+                            full_tree=True,
+                        )
 
                 # Switch self.compiled flag to True and log procedure info
                 self.compiled = True